@@ -1,9 +1,29 @@
 import logging
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
-from .api import PanasonicApiClient
-from .const import CONF_SSID, DOMAIN
+from .api import LoginSession, PanasonicApiClient
+from .const import (
+    CONF_CONNECTION_POOL_SIZE,
+    CONF_FAMILY_ID,
+    CONF_HEDGE_STATUS_READS,
+    CONF_LOGIN_DIGEST,
+    CONF_REAL_FAMILY_ID,
+    CONF_REQUEST_TIMEOUT_MAX,
+    CONF_REQUEST_TIMEOUT_MIN,
+    CONF_SSID,
+    CONF_USERNAME,
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_HEDGE_STATUS_READS,
+    DEFAULT_REQUEST_TIMEOUT_MAX,
+    DEFAULT_REQUEST_TIMEOUT_MIN,
+    DOMAIN,
+)
+from .coordinator import (
+    COMMAND_JOURNALS_KEY,
+    PanasonicStatusCoordinator,
+    status_store,
+)
 from .profiles import supported_platforms
 
 _LOGGER = logging.getLogger(__name__)
@@ -16,15 +36,75 @@ async def async_setup(hass: HomeAssistant, config: dict):
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        "client": PanasonicApiClient(hass, entry.data.get(CONF_SSID)),
-    }
-    
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    client = PanasonicApiClient(
+        hass,
+        entry.data.get(CONF_SSID),
+        connection_pool_size=entry.options.get(
+            CONF_CONNECTION_POOL_SIZE, DEFAULT_CONNECTION_POOL_SIZE
+        ),
+        hedge_status_reads=entry.options.get(
+            CONF_HEDGE_STATUS_READS, DEFAULT_HEDGE_STATUS_READS
+        ),
+        request_timeout_min=entry.options.get(
+            CONF_REQUEST_TIMEOUT_MIN, DEFAULT_REQUEST_TIMEOUT_MIN
+        ),
+        request_timeout_max=entry.options.get(
+            CONF_REQUEST_TIMEOUT_MAX, DEFAULT_REQUEST_TIMEOUT_MAX
+        ),
+    )
+    if entry.data.get(CONF_LOGIN_DIGEST):
+        client.enable_relogin(
+            entry.data[CONF_USERNAME],
+            entry.data[CONF_LOGIN_DIGEST],
+            _session_saver(hass, entry),
+        )
+    coordinator = PanasonicStatusCoordinator(hass, entry, client)
+    try:
+        await coordinator.async_restore()
+        await coordinator.async_initial_refresh()
+        coordinator.async_start()
+        hass.data[DOMAIN][entry.entry_id] = {
+            "client": client,
+            "coordinator": coordinator,
+        }
+
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except BaseException:
+        # Setup failed or was cancelled: release the pool created for this entry.
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await coordinator.async_shutdown()
+        await client.async_close()
+        raise
     return True
 
+def _session_saver(hass: HomeAssistant, entry: ConfigEntry):
+    """Persist a renewed session without reloading the entry."""
+
+    @callback
+    def _save(session: LoginSession) -> None:
+        hass.config_entries.async_update_entry(
+            entry,
+            data={
+                **entry.data,
+                CONF_SSID: session.ssid,
+                CONF_FAMILY_ID: session.family_id,
+                CONF_REAL_FAMILY_ID: session.real_family_id,
+            },
+        )
+
+    return _save
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        runtime = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if runtime:
+            await runtime["coordinator"].async_shutdown()
+            await runtime["client"].async_close()
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    hass.data.get(COMMAND_JOURNALS_KEY, {}).pop(entry.entry_id, None)
+    # Unloading already flushed the coordinator's pending save, so nothing
+    # writes the file back after it is removed.
+    await status_store(hass, entry.entry_id).async_remove()
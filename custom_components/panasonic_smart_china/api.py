@@ -2,24 +2,96 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass
 import hashlib
+import logging
+import re
+import time
+from types import MappingProxyType
 from typing import Any
+from urllib.parse import urlsplit
 
+import aiohttp
 import async_timeout
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson ships with Home Assistant; stay usable without it
+    from json import loads as json_loads
+
+from .const import DOMAIN
 from .models import PanasonicEndpoint, PanasonicProfile
+from .resilience import (
+    HEDGE_PERCENTILE,
+    PRIORITY_COMMAND,
+    PRIORITY_DISCOVERY,
+    PRIORITY_POLL,
+    REQUEST_TIMEOUT_FALLBACK,
+    REQUEST_TIMEOUT_MAX,
+    REQUEST_TIMEOUT_MIN,
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    HedgeBudget,
+    LatencyTracker,
+    backoff_delay,
+)
+from .status import StatusSnapshot, status_snapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+RATE_LIMITER_KEY = f"{DOMAIN}_rate_limiter"
 
 BASE_URL = "https://app.psmartcloud.com/App"
 URL_LOGIN = f"{BASE_URL}/UsrLogin"
 URL_GET_DEV = f"{BASE_URL}/UsrGetBindDevInfo"
 URL_GET_TOKEN = f"{BASE_URL}/UsrGetToken"
 
+# Login and device list calls are rare, so they seldom have latency samples,
+# and large accounts can take long to list. Until measured they get the
+# upper timeout bound instead of the fallback.
+SLOW_START_PATHS = frozenset(
+    url.rsplit("/", 1)[-1] for url in (URL_LOGIN, URL_GET_DEV, URL_GET_TOKEN)
+)
+
 AUTH_ERROR_CODES = {"3003", "3004", "403", "4102"}
+# Finds an auth error code anywhere in a raw non-JSON body in one pass.
+AUTH_ERROR_PATTERN = re.compile(
+    "|".join(re.escape(code) for code in sorted(AUTH_ERROR_CODES)).encode()
+)
 SUCCESS_ERROR_CODES = {None, "", 0, "0", "0000"}
 
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+# Connections kept on top of the pool size so commands never wait for polls.
+RESERVED_COMMAND_CONNECTIONS = 1
+
+# Only idempotent status reads are retried; set endpoints are never resent.
+STATUS_READ_RETRIES = 2
+
+# Seconds to wait before logging in again after a re-login. The wait doubles
+# while the session keeps being taken over (e.g. by the phone app) and starts
+# over once a session has lasted RELOGIN_BACKOFF_RESET.
+RELOGIN_BACKOFF_MIN = 5.0
+RELOGIN_BACKOFF_MAX = 120.0
+RELOGIN_BACKOFF_RESET = 600.0
+
+APP_HEADERS = {
+    "User-Agent": "SmartApp",
+    "Content-Type": "application/json",
+}
+CONTROL_HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 18_5 like Mac OS X)",
+    "DNT": "1",
+    "Origin": "https://app.psmartcloud.com",
+    "X-Requested-With": "XMLHttpRequest",
+}
+
 
 class PanasonicApiError(Exception):
     """Base exception for Panasonic cloud API failures."""
@@ -33,6 +105,59 @@ class PanasonicApiResponseError(PanasonicApiError):
     """Raised when the Panasonic cloud returns an invalid response."""
 
 
+class PanasonicApiConnectionError(PanasonicApiResponseError):
+    """Raised when the Panasonic cloud cannot be reached or times out."""
+
+    def __init__(self, message: str, http_status: int | None = None) -> None:
+        super().__init__(message)
+        self.http_status = http_status
+
+    @property
+    def is_overload(self) -> bool:
+        """Return whether the failure suggests the cloud is overloaded.
+
+        Transport failures and timeouts count, as do HTTP 429 and 5xx; other
+        HTTP errors are about the request itself.
+        """
+        return (
+            self.http_status is None
+            or self.http_status == 429
+            or self.http_status >= 500
+        )
+
+
+class PanasonicApiTimeoutError(PanasonicApiConnectionError):
+    """Raised when the cloud did not answer within the request timeout."""
+
+
+class PanasonicApiCircuitOpenError(PanasonicApiError):
+    """Raised when an endpoint is short-circuited after repeated failures."""
+
+
+class PanasonicApiReloginDeferredError(PanasonicApiError):
+    """Raised when the session is lost again before the re-login backoff ends."""
+
+
+def login_digest(username: str, password: str) -> str:
+    """Return the salted password digest the login handshake is built from.
+
+    Storing this digest lets the session be renewed without keeping the
+    plaintext password.
+    """
+    pwd_md5 = hashlib.md5(password.encode()).hexdigest().upper()
+    return hashlib.md5(f"{pwd_md5}{username}".encode()).hexdigest().upper()
+
+
+@dataclass(frozen=True)
+class LoginSession:
+    """Session identifiers returned by a successful login."""
+
+    usr_id: str
+    ssid: str
+    family_id: str
+    real_family_id: str
+
+
 @dataclass(frozen=True)
 class LoginResult:
     """Successful login result."""
@@ -44,15 +169,181 @@ class LoginResult:
     devices: dict[str, dict[str, Any]]
 
 
+def _preview(body: bytes) -> str:
+    """Return the start of a response body for error messages."""
+    return body[:200].decode(errors="replace")
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant) -> AdaptiveRateLimiter:
+    """Return the process-wide limiter shared by every client of the cloud host."""
+    limiter = hass.data.get(RATE_LIMITER_KEY)
+    if limiter is None:
+        limiter = hass.data[RATE_LIMITER_KEY] = AdaptiveRateLimiter()
+    return limiter
+
+
 class PanasonicApiClient:
     """Small async client for the reverse engineered Panasonic cloud API."""
 
-    def __init__(self, hass: HomeAssistant, ssid: str | None = None) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        ssid: str | None = None,
+        *,
+        connection_pool_size: int | None = None,
+        hedge_status_reads: bool = False,
+        request_timeout_min: float = REQUEST_TIMEOUT_MIN,
+        request_timeout_max: float = REQUEST_TIMEOUT_MAX,
+    ) -> None:
+        """Create a client.
+
+        Without a pool size the shared Home Assistant session is used, which
+        suits short-lived clients such as the config flow. Account entries pass
+        a pool size and get a dedicated keep-alive connection pool.
+
+        With ``hedge_status_reads`` a status read still unanswered after the
+        endpoint's observed p95 latency is raced by a second identical read.
+
+        Request timeouts follow each endpoint's observed latency within
+        ``request_timeout_min`` and ``request_timeout_max`` seconds.
+        """
         self._hass = hass
-        self.ssid = ssid
+        self._ssid = ssid
+        self._control_header_cache: dict[
+            tuple[str | None, str | None, str | None], Mapping[str, str]
+        ] = {}
+        self._connection_pool_size = connection_pool_size
+        self._session: aiohttp.ClientSession | None = None
+        self._unsub_close: CALLBACK_TYPE | None = None
+        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self._latency_trackers: dict[str, LatencyTracker] = {}
+        self._hedge_status_reads = hedge_status_reads
+        self._request_timeout_min = request_timeout_min
+        self._request_timeout_max = request_timeout_max
+        self.hedge_budget = HedgeBudget()
+        self.rate_limiter = async_get_rate_limiter(hass)
+        self._status_reads: dict[tuple[str, str], tuple[asyncio.Task, int]] = {}
+        self._relogin_credentials: tuple[str, str] | None = None
+        self._on_session_refreshed: Callable[[LoginSession], None] | None = None
+        self._relogin_task: asyncio.Task | None = None
+        self._relogin_at: float | None = None
+        self._relogin_backoff = RELOGIN_BACKOFF_MIN
+
+    @property
+    def ssid(self) -> str | None:
+        return self._ssid
+
+    @ssid.setter
+    def ssid(self, ssid: str | None) -> None:
+        if ssid != self._ssid:
+            # Headers embed the SSID; drop the ones built for the old session.
+            self._control_header_cache.clear()
+        self._ssid = ssid
+
+    @property
+    def circuit_breakers(self) -> dict[str, CircuitBreaker]:
+        """Circuit breakers keyed by endpoint path."""
+        return self._circuit_breakers
+
+    def circuit_state(self, path: str) -> str:
+        """Return the circuit state of an endpoint path."""
+        return self._circuit_breaker(path).state
+
+    def _circuit_breaker(self, path: str) -> CircuitBreaker:
+        breaker = self._circuit_breakers.get(path)
+        if breaker is None:
+            breaker = self._circuit_breakers[path] = CircuitBreaker()
+        return breaker
+
+    @property
+    def latency_trackers(self) -> dict[str, LatencyTracker]:
+        """Response latency trackers keyed by endpoint path."""
+        return self._latency_trackers
+
+    def _latency_tracker(self, path: str) -> LatencyTracker:
+        tracker = self._latency_trackers.get(path)
+        if tracker is None:
+            tracker = self._latency_trackers[path] = LatencyTracker()
+        return tracker
+
+    def request_timeout(self, path: str) -> float:
+        """Return the current timeout for requests to an endpoint path."""
+        return self._latency_tracker(path).timeout(
+            self._request_timeout_min,
+            self._request_timeout_max,
+            (
+                self._request_timeout_max
+                if path in SLOW_START_PATHS
+                else REQUEST_TIMEOUT_FALLBACK
+            ),
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._connection_pool_size is None:
+            return async_get_clientsession(self._hass)
+        if self._session is None or self._session.closed:
+            # Dedicated pool: keep-alive reuses TCP/TLS connections to the cloud host.
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._connection_pool_size + RESERVED_COMMAND_CONNECTIONS,
+                    limit_per_host=(
+                        self._connection_pool_size + RESERVED_COMMAND_CONNECTIONS
+                    ),
+                    ttl_dns_cache=DNS_CACHE_TTL,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT,
+                    ssl=False,
+                ),
+            )
+            if self._unsub_close is None:
+                # Entries are not unloaded on shutdown; close the pool with HA.
+                self._unsub_close = self._hass.bus.async_listen_once(
+                    EVENT_HOMEASSISTANT_CLOSE, self._async_handle_close
+                )
+        return self._session
+
+    async def _async_handle_close(self, event: Event) -> None:
+        self._unsub_close = None
+        await self._async_close_session()
+
+    async def _async_close_session(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def async_close(self) -> None:
+        """Cancel shared reads and close the dedicated connection pool."""
+        for task, _ in list(self._status_reads.values()):
+            task.cancel()
+        if self._relogin_task is not None:
+            self._relogin_task.cancel()
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        await self._async_close_session()
 
     async def authenticate(self, username: str, password: str) -> LoginResult:
         """Run the full login flow and return the account devices."""
+        session = await self.login(username, login_digest(username, password))
+        devices = await self.get_devices(
+            session.usr_id, session.family_id, session.real_family_id
+        )
+        return LoginResult(
+            usr_id=session.usr_id,
+            ssid=session.ssid,
+            family_id=session.family_id,
+            real_family_id=session.real_family_id,
+            devices=devices,
+        )
+
+    async def login(
+        self,
+        username: str,
+        digest: str,
+        *,
+        priority: int = PRIORITY_DISCOVERY,
+    ) -> LoginSession:
+        """Log in with a password digest and switch the client to the new SSID."""
         token_res = await self._post(
             URL_GET_TOKEN,
             {
@@ -62,14 +353,13 @@ class PanasonicApiClient:
             },
             headers=self._app_headers(),
             require_results=True,
+            priority=priority,
         )
         token_start = token_res["results"].get("token")
         if not token_start:
             raise PanasonicApiResponseError("GetToken response did not include token")
 
-        pwd_md5 = hashlib.md5(password.encode()).hexdigest().upper()
-        inter_md5 = hashlib.md5(f"{pwd_md5}{username}".encode()).hexdigest().upper()
-        final_token = hashlib.md5(f"{inter_md5}{token_start}".encode()).hexdigest().upper()
+        final_token = hashlib.md5(f"{digest}{token_start}".encode()).hexdigest().upper()
 
         login_res = await self._post(
             URL_LOGIN,
@@ -85,40 +375,136 @@ class PanasonicApiClient:
             },
             headers=self._app_headers(),
             require_results=True,
+            priority=priority,
         )
         results = login_res["results"]
-        usr_id = results["usrId"]
-        ssid = results["ssId"]
-        family_id = results["familyId"]
-        real_family_id = results["realFamilyId"]
-
-        self.ssid = ssid
-        devices = await self.get_devices(usr_id, family_id, real_family_id)
-        return LoginResult(
-            usr_id=usr_id,
-            ssid=ssid,
-            family_id=family_id,
-            real_family_id=real_family_id,
-            devices=devices,
+        session = LoginSession(
+            usr_id=results["usrId"],
+            ssid=results["ssId"],
+            family_id=results["familyId"],
+            real_family_id=results["realFamilyId"],
         )
+        self.ssid = session.ssid
+        return session
+
+    def enable_relogin(
+        self,
+        username: str,
+        digest: str,
+        on_session_refreshed: Callable[[LoginSession], None] | None = None,
+    ) -> None:
+        """Renew the session automatically when a request hits an auth error."""
+        self._relogin_credentials = (username, digest)
+        self._on_session_refreshed = on_session_refreshed
+
+    async def _call_with_relogin(
+        self, request: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Run a session-bound request, re-logging in once on auth errors.
+
+        ``request`` must build its headers when called so the retry uses the
+        renewed SSID. With re-login enabled, auth errors only surface once
+        the credentials are rejected; while re-logins back off,
+        ``PanasonicApiReloginDeferredError`` is raised instead.
+        """
+        failed_ssid = self.ssid
+        try:
+            return await request()
+        except PanasonicApiAuthError as err:
+            if self._relogin_credentials is None:
+                raise
+            wait = self._relogin_wait(failed_ssid)
+            if wait > 0:
+                # Not an auth failure: the credentials still work, so callers
+                # treat this as a transient error instead of asking for reauth.
+                raise PanasonicApiReloginDeferredError(
+                    f"Session lost again; logging in again in {wait:.0f}s"
+                ) from err
+        await self._async_relogin(failed_ssid)
+        try:
+            return await request()
+        except PanasonicApiAuthError as err:
+            if self._relogin_credentials is None:
+                raise
+            # Taken over again right after logging in; back off as well.
+            raise PanasonicApiReloginDeferredError(
+                f"Session lost again right after logging in: {err}"
+            ) from err
+
+    def _relogin_wait(self, failed_ssid: str | None) -> float:
+        """Return the seconds left before another re-login may start."""
+        if self.ssid != failed_ssid or self._relogin_task is not None:
+            # Renewed meanwhile, or a re-login is already running to join.
+            return 0.0
+        if self._relogin_at is None:
+            return 0.0
+        return self._relogin_at + self._relogin_backoff - time.monotonic()
+
+    async def _async_relogin(self, failed_ssid: str | None) -> None:
+        if self.ssid != failed_ssid:
+            # Another request already renewed the session.
+            return
+        task = self._relogin_task
+        if task is None:
+            now = time.monotonic()
+            if (
+                self._relogin_at is None
+                or now - self._relogin_at >= RELOGIN_BACKOFF_RESET
+            ):
+                self._relogin_backoff = RELOGIN_BACKOFF_MIN
+            else:
+                self._relogin_backoff = min(
+                    RELOGIN_BACKOFF_MAX, self._relogin_backoff * 2
+                )
+            self._relogin_at = now
+            task = self._relogin_task = asyncio.ensure_future(self._relogin())
+            task.add_done_callback(self._finish_relogin)
+        await asyncio.shield(task)
+
+    async def _relogin(self) -> None:
+        username, digest = self._relogin_credentials
+        _LOGGER.info("Panasonic session expired; logging in again")
+        try:
+            session = await self.login(username, digest, priority=PRIORITY_COMMAND)
+        except (PanasonicApiConnectionError, PanasonicApiCircuitOpenError):
+            # Cloud unreachable; the next attempt may use the credentials again.
+            raise
+        except PanasonicApiError as err:
+            # Credentials rejected (e.g. password changed): stop using them and
+            # surface an auth error so the entry asks for reauth.
+            self._relogin_credentials = None
+            _LOGGER.error(
+                "Automatic re-login failed; disabled until reauth: %s", err
+            )
+            raise PanasonicApiAuthError(f"Automatic re-login failed: {err}") from err
+        if self._on_session_refreshed:
+            self._on_session_refreshed(session)
+
+    def _finish_relogin(self, task: asyncio.Task) -> None:
+        self._relogin_task = None
+        if not task.cancelled():
+            task.exception()
 
     async def get_devices(
         self, usr_id: str, family_id: str, real_family_id: str
     ) -> dict[str, dict[str, Any]]:
         """Return all bound devices for the current account session."""
-        res = await self._post(
-            URL_GET_DEV,
-            {
-                "id": 3,
-                "uiVersion": 4.0,
-                "params": {
-                    "realFamilyId": real_family_id,
-                    "familyId": family_id,
-                    "usrId": usr_id,
+        res = await self._call_with_relogin(
+            lambda: self._post(
+                URL_GET_DEV,
+                {
+                    "id": 3,
+                    "uiVersion": 4.0,
+                    "params": {
+                        "realFamilyId": real_family_id,
+                        "familyId": family_id,
+                        "usrId": usr_id,
+                    },
                 },
-            },
-            headers=self._app_headers(include_cookie=True),
-            require_results=True,
+                headers=self._app_headers(include_cookie=True),
+                require_results=True,
+                priority=PRIORITY_DISCOVERY,
+            )
         )
 
         devices = {}
@@ -135,20 +521,74 @@ class PanasonicApiClient:
         usr_id: str,
         device_id: str,
         token: str,
-    ) -> dict[str, Any]:
-        """Fetch the latest status for a supported device profile."""
+        *,
+        priority: int = PRIORITY_POLL,
+    ) -> StatusSnapshot:
+        """Fetch the latest status for a supported device profile.
+
+        The status is returned as an immutable snapshot typed by the profile
+        protocol.
+
+        Concurrent reads of the same device and endpoint share one in-flight
+        request and all callers receive its result. Command paths pass
+        ``PRIORITY_COMMAND`` so their read jumps ahead of queued polls; such a
+        read starts its own request instead of joining a poll-lane one, and
+        later readers join the more urgent request.
+        """
+        key = (device_id, profile.status_endpoint.path)
+        shared = self._status_reads.get(key)
+        # Only join a read queued in the same or a more urgent lane; a command
+        # must not wait behind polls because a poll of its device is queued.
+        if shared is not None and shared[1] <= priority:
+            task = shared[0]
+        else:
+            task = asyncio.ensure_future(
+                self._fetch_device_status(
+                    profile, usr_id, device_id, token, priority
+                )
+            )
+            self._status_reads[key] = (task, priority)
+            task.add_done_callback(
+                lambda done: self._finish_status_read(key, done)
+            )
+        # Shield so one cancelled caller does not cancel the shared request.
+        return await asyncio.shield(task)
+
+    def _finish_status_read(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        shared = self._status_reads.get(key)
+        if shared is not None and shared[0] is task:
+            del self._status_reads[key]
+        if not task.cancelled():
+            # Retrieve the exception in case every awaiter was cancelled.
+            task.exception()
+
+    async def _fetch_device_status(
+        self,
+        profile: PanasonicProfile,
+        usr_id: str,
+        device_id: str,
+        token: str,
+        priority: int,
+    ) -> StatusSnapshot:
         endpoint = profile.status_endpoint
-        res = await self._post(
-            self._endpoint_url(endpoint),
-            {
-                "id": endpoint.request_id,
-                "usrId": usr_id,
-                "deviceId": device_id,
-                "token": token,
-            },
-            headers=self._control_headers(profile, device_id),
-            require_results=endpoint.require_results,
-            allow_non_json_response=endpoint.allow_non_json_response,
+        res = await self._call_with_relogin(
+            lambda: self._hedged(
+                endpoint.path,
+                lambda: self._post(
+                    self._endpoint_url(endpoint),
+                    {
+                        "id": endpoint.request_id,
+                        "usrId": usr_id,
+                        "deviceId": device_id,
+                        "token": token,
+                    },
+                    headers=self._control_headers(profile, device_id),
+                    require_results=endpoint.require_results,
+                    allow_non_json_response=endpoint.allow_non_json_response,
+                    retries=STATUS_READ_RETRIES,
+                    priority=priority,
+                ),
+            )
         )
 
         results = res.get("results") if endpoint.require_results else res.get("results", res)
@@ -159,7 +599,50 @@ class PanasonicApiClient:
             raise PanasonicApiResponseError(
                 f"Status response did not include required keys: {sorted(missing_keys)}"
             )
-        return results
+        return status_snapshot(profile.protocol, results)
+
+    async def _hedged(
+        self, path: str, request: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Run an idempotent request, racing a second copy if the first is slow.
+
+        The hedge is sent once the first request has been outstanding for the
+        endpoint's p95 latency, within the hedge budget. The first successful
+        answer wins and the other request is cancelled.
+
+        Only answered requests count towards the p95. After a timeout the
+        endpoint is struggling rather than slow by chance, so no hedge is
+        sent until it answers again.
+        """
+        tracker = self._latency_tracker(path)
+        hedge_after = (
+            tracker.percentile(HEDGE_PERCENTILE)
+            if self._hedge_status_reads and not tracker.timed_out
+            else None
+        )
+        if hedge_after is None:
+            return await request()
+
+        pending = {asyncio.ensure_future(request())}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if not done and self.hedge_budget.try_acquire():
+                _LOGGER.debug("Hedging slow %s request after %.2fs", path, hedge_after)
+                pending.add(asyncio.ensure_future(request()))
+            error: BaseException | None = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def set_device_status(
         self,
@@ -171,18 +654,23 @@ class PanasonicApiClient:
     ) -> dict[str, Any]:
         """Send status/control params for a supported device profile."""
         endpoint = profile.set_endpoint
-        return await self._post(
-            self._endpoint_url(endpoint),
-            {
-                "id": endpoint.request_id,
-                "usrId": usr_id,
-                "deviceId": device_id,
-                "token": token,
-                "params": params,
-            },
-            headers=self._control_headers(profile, device_id),
-            require_results=endpoint.require_results,
-            allow_non_json_response=endpoint.allow_non_json_response,
+        # An auth error means the command was rejected unexecuted, so it is
+        # safe to resend it once with the renewed session.
+        return await self._call_with_relogin(
+            lambda: self._post(
+                self._endpoint_url(endpoint),
+                {
+                    "id": endpoint.request_id,
+                    "usrId": usr_id,
+                    "deviceId": device_id,
+                    "token": token,
+                    "params": params,
+                },
+                headers=self._control_headers(profile, device_id),
+                require_results=endpoint.require_results,
+                allow_non_json_response=endpoint.allow_non_json_response,
+                priority=PRIORITY_COMMAND,
+            )
         )
 
     async def _post(
@@ -190,40 +678,104 @@ class PanasonicApiClient:
         url: str,
         payload: dict[str, Any],
         *,
-        headers: dict[str, str],
+        headers: Mapping[str, str],
         require_results: bool,
         allow_non_json_response: bool = False,
+        retries: int = 0,
+        priority: int = PRIORITY_POLL,
     ) -> dict[str, Any]:
-        session = async_get_clientsession(self._hass)
+        path = urlsplit(url).path.rsplit("/", 1)[-1]
+        breaker = self._circuit_breaker(path)
+        attempt = 0
+        while True:
+            if not breaker.allow_request():
+                raise PanasonicApiCircuitOpenError(
+                    f"Circuit open for {path}; skipping request"
+                )
+            await self.rate_limiter.acquire(priority)
+            timeout = self.request_timeout(path)
+            started = time.monotonic()
+            try:
+                data = await self._post_once(
+                    url,
+                    payload,
+                    headers=headers,
+                    require_results=require_results,
+                    allow_non_json_response=allow_non_json_response,
+                    timeout=timeout,
+                )
+            except PanasonicApiConnectionError as err:
+                if isinstance(err, PanasonicApiTimeoutError):
+                    # The next request falls back to the unmeasured timeout,
+                    # so a slowing endpoint can still answer and be measured.
+                    self._latency_tracker(path).record_timeout()
+                breaker.record_failure()
+                if err.is_overload:
+                    self.rate_limiter.record_failure()
+                if attempt >= retries:
+                    raise
+            except PanasonicApiError:
+                # The cloud answered (business or auth error), so the endpoint
+                # is healthy. Per-device errors must not slow the shared
+                # limiter down for every account.
+                self._latency_tracker(path).record(time.monotonic() - started)
+                breaker.record_success()
+                self.rate_limiter.record_success()
+                raise
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                self._latency_tracker(path).record(time.monotonic() - started)
+                breaker.record_success()
+                self.rate_limiter.record_success()
+                return data
+
+            await asyncio.sleep(backoff_delay(attempt))
+            attempt += 1
+
+    async def _post_once(
+        self,
+        url: str,
+        payload: dict[str, Any],
+        *,
+        headers: Mapping[str, str],
+        require_results: bool,
+        allow_non_json_response: bool,
+        timeout: float,
+    ) -> dict[str, Any]:
+        session = self._get_session()
         try:
-            async with async_timeout.timeout(10):
+            async with async_timeout.timeout(timeout):
                 response = await session.post(url, json=payload, headers=headers, ssl=False)
-                if response.status != 200:
-                    text = await response.text()
-                    raise PanasonicApiResponseError(
-                        f"HTTP {response.status} from {url}: {text[:200]}"
-                    )
-
-                try:
-                    data = await response.json()
-                except Exception as err:
-                    text = await response.text()
-                    if allow_non_json_response:
-                        for auth_code in AUTH_ERROR_CODES:
-                            if auth_code in text:
-                                raise PanasonicApiAuthError(
-                                    f"Panasonic session expired (errorCode: {auth_code})"
-                                ) from err
-                        return {}
-                    raise PanasonicApiResponseError(
-                        f"Invalid JSON from {url}: {text[:200]}"
-                    ) from err
-        except PanasonicApiError:
-            raise
+                # Read the body once; decoding and error classification work on the bytes.
+                body = await response.read()
         except TimeoutError as err:
-            raise PanasonicApiResponseError(f"Request timed out: {url}") from err
+            raise PanasonicApiTimeoutError(
+                f"Request timed out after {timeout:.1f}s: {url}"
+            ) from err
         except Exception as err:
-            raise PanasonicApiResponseError(f"Request failed: {url}: {err}") from err
+            raise PanasonicApiConnectionError(f"Request failed: {url}: {err}") from err
+
+        if response.status != 200:
+            raise PanasonicApiConnectionError(
+                f"HTTP {response.status} from {url}: {_preview(body)}",
+                http_status=response.status,
+            )
+
+        try:
+            data = json_loads(body)
+        except ValueError as err:
+            if allow_non_json_response:
+                match = AUTH_ERROR_PATTERN.search(body)
+                if match:
+                    raise PanasonicApiAuthError(
+                        f"Panasonic session expired (errorCode: {match.group().decode()})"
+                    ) from err
+                return {}
+            raise PanasonicApiResponseError(
+                f"Invalid JSON from {url}: {_preview(body)}"
+            ) from err
 
         if not isinstance(data, dict):
             raise PanasonicApiResponseError(f"Unexpected JSON response from {url}")
@@ -252,13 +804,9 @@ class PanasonicApiClient:
         raise PanasonicApiResponseError(f"{message} (errorCode: {error_code_text})")
 
     def _app_headers(self, include_cookie: bool = False) -> dict[str, str]:
-        headers = {
-            "User-Agent": "SmartApp",
-            "Content-Type": "application/json",
-        }
         if include_cookie and self.ssid:
-            headers["Cookie"] = f"SSID={self.ssid}"
-        return headers
+            return {**APP_HEADERS, "Cookie": f"SSID={self.ssid}"}
+        return APP_HEADERS
 
     def _endpoint_url(self, endpoint: PanasonicEndpoint) -> str:
         return f"{BASE_URL}/{endpoint.path}"
@@ -267,17 +815,24 @@ class PanasonicApiClient:
         self,
         profile: PanasonicProfile | None = None,
         device_id: str | None = None,
+    ) -> Mapping[str, str]:
+        """Return the immutable control headers for a device and the current SSID."""
+        key = (profile.profile_id if profile else None, device_id, self._ssid)
+        headers = self._control_header_cache.get(key)
+        if headers is None:
+            headers = self._control_header_cache[key] = MappingProxyType(
+                self._build_control_headers(profile, device_id)
+            )
+        return headers
+
+    def _build_control_headers(
+        self,
+        profile: PanasonicProfile | None,
+        device_id: str | None,
     ) -> dict[str, str]:
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 18_5 like Mac OS X)",
-            "xtoken": f"SSID={self.ssid}",
-            "DNT": "1",
-            "Origin": "https://app.psmartcloud.com",
-            "X-Requested-With": "XMLHttpRequest",
-        }
-        if profile and profile.cookie_required and self.ssid:
-            headers["Cookie"] = f"SSID={self.ssid}"
+        headers = {**CONTROL_HEADERS, "xtoken": f"SSID={self._ssid}"}
+        if profile and profile.cookie_required and self._ssid:
+            headers["Cookie"] = f"SSID={self._ssid}"
         if profile and profile.referer_template:
             headers["Referer"] = profile.referer_template.format(
                 device_id=device_id or "",
@@ -1,5 +1,4 @@
 import logging
-from datetime import timedelta
 
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import (
@@ -13,70 +12,48 @@ from homeassistant.const import (
     STATE_UNKNOWN,
     UnitOfTemperature,
 )
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
 
-from .api import PanasonicApiAuthError, PanasonicApiClient, PanasonicApiError
+from .api import PRIORITY_COMMAND, PanasonicApiAuthError, PanasonicApiError
+from .commands import is_noop_command
 from .const import (
-    CONF_CATEGORY,
     CONF_CONTROLLER_MODEL,
     CONF_DEVICE_ID,
     CONF_DEVICE_MODEL,
-    CONF_DEVICE_NAME,
-    CONF_DEVICES,
-    CONF_ENABLED,
+    CONF_OPTIMISTIC_UPDATES,
     CONF_SENSOR_ID,
-    CONF_SSID,
     CONF_TOKEN,
     CONF_USR_ID,
-    CONF_PROFILE_ID,
+    DEFAULT_OPTIMISTIC_UPDATES,
     DOMAIN,
-    FAN_MUTE,
 )
 from .models import (
     ENTITY_KIND_BATHROOM_HEATER,
     ENTITY_KIND_DUCTED_AC,
     PLATFORM_CLIMATE,
+    WRITE_STRATEGY_FIXED_PAYLOAD,
 )
-from .profiles import find_profile_for_device_config
+from .profiles import profile_codec
 
 _LOGGER = logging.getLogger(__name__)
 
-# === 轮询频率 ===
-POLLING_INTERVAL = timedelta(seconds=15)
-
-
-def _as_int(value, default=None):
-    """Best-effort int conversion for Panasonic status fields."""
-    if value is None:
-        return default
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return default
+# 乐观更新的对账窗口：窗口内与指令矛盾的轮询结果会被忽略
+OPTIMISTIC_RECONCILE_WINDOW = 20.0
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Create climate entities for enabled devices under an account entry."""
-    runtime = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
-    client = runtime.get("client") or PanasonicApiClient(hass, entry.data.get(CONF_SSID))
-    devices = entry.data.get(CONF_DEVICES, {})
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
     entities = []
-    for device_id, device_config in devices.items():
-        if not device_config.get(CONF_ENABLED, True):
-            continue
-
-        profile = find_profile_for_device_config(
-            profile_id=device_config.get(CONF_PROFILE_ID),
-            controller_model=device_config.get(CONF_CONTROLLER_MODEL),
-            category_id=device_config.get(CONF_CATEGORY),
-        )
-        if not profile:
-            _LOGGER.error("Device profile not found for %s.", device_id)
-            continue
-
+    for device in coordinator.devices.values():
+        profile = device.profile
         if PLATFORM_CLIMATE not in profile.ha_platforms:
             continue
 
@@ -85,48 +62,45 @@ async def async_setup_entry(hass, entry, async_add_entities):
             _LOGGER.error(
                 "Climate entity kind %s not implemented for %s.",
                 profile.entity_kind,
-                device_id,
+                device.device_id,
             )
             continue
 
-        entity_config = {
-            **entry.data,
-            **device_config,
-            CONF_DEVICE_ID: device_id,
-        }
         entities.append(
             entity_class(
                 hass,
                 entry,
-                entity_config,
-                device_config.get(CONF_DEVICE_NAME, device_id),
+                device.config,
+                device.name,
                 profile,
-                client,
+                coordinator,
             )
         )
 
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
 
 
 # ============================================================
 # 基类：所有松下设备共享的逻辑
 # ============================================================
 class PanasonicBaseEntity(ClimateEntity):
-    """松下设备基类 — 包含轮询、状态获取、命令发送等通用逻辑"""
+    """松下设备基类 — 包含状态订阅、命令发送等通用逻辑"""
 
-    def __init__(self, hass, entry, config, name, profile, client):
+    def __init__(self, hass, entry, config, name, profile, coordinator):
         self._hass = hass
         self._entry = entry
         self._usr_id = config[CONF_USR_ID]
         self._device_id = config[CONF_DEVICE_ID]
         self._token = config[CONF_TOKEN]
         self._model = config.get(CONF_DEVICE_MODEL) or config.get(CONF_CONTROLLER_MODEL)
-        self._api = client
+        self._coordinator = coordinator
+        self._api = coordinator.client
         self._attr_name = name
         self._attr_unique_id = f"panasonic_smart_china_{self._device_id}_climate"
 
         # 控制器配置
         self._profile = profile
+        self._codec = profile_codec(profile)
         self._temp_scale = profile.temp_scale
         self._hvac_map = profile.hvac_mapping
         self._default_hvac_mode = profile.default_hvac_mode or HVACMode.COOL
@@ -137,12 +111,17 @@ class PanasonicBaseEntity(ClimateEntity):
         self._hvac_mode = self._default_hvac_mode
         self._target_temperature = 26.0
         self._last_active_target_temperature = self._target_temperature
-        self._last_params = {}
 
-        # 定时器句柄
-        self._unsub_polling = None
+        # 乐观更新：指令发出后立即展示目标状态，直到轮询确认或对账窗口结束
+        self._optimistic = entry.options.get(
+            CONF_OPTIMISTIC_UPDATES, DEFAULT_OPTIMISTIC_UPDATES
+        )
+        self._optimistic_changes = {}
+        self._optimistic_since = 0.0
+        self._unsub_reconcile = None
+        self._last_state_fingerprint = None
 
-    # --- 轮询管理 ---
+    # --- 状态订阅 ---
 
     @property
     def should_poll(self):
@@ -164,20 +143,107 @@ class PanasonicBaseEntity(ClimateEntity):
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        self._unsub_polling = async_track_time_interval(
-            self._hass, self._async_update_interval_wrapper, POLLING_INTERVAL
+        self.async_on_remove(
+            self._coordinator.async_add_listener(
+                self._device_id, self._handle_coordinator_update
+            )
+        )
+        self.async_on_remove(
+            self._coordinator.async_register_writer(
+                self._device_id, self._async_write_and_reconcile
+            )
         )
+        self._apply_coordinator_status()
+        # HA 会在实体添加后写入初始状态
+        self._last_state_fingerprint = self._state_fingerprint()
 
     async def async_will_remove_from_hass(self):
-        if self._unsub_polling:
-            self._unsub_polling()
-            self._unsub_polling = None
+        self._cancel_reconcile_timer()
         await super().async_will_remove_from_hass()
 
-    async def _async_update_interval_wrapper(self, now):
-        await self.async_update()
+    def _apply_coordinator_status(self):
+        """从共享 coordinator 同步最新状态到实体内部变量"""
+        self._available = self._coordinator.is_available(self._device_id)
+        status = self._coordinator.data.get(self._device_id)
+        if self._optimistic_changes:
+            status = self._reconcile_optimistic(status)
+        if status:
+            self._update_local_state(status)
+
+    def _reconcile_optimistic(self, status):
+        """对账：轮询确认后或窗口结束后丢弃乐观状态，否则覆盖在轮询结果之上"""
+        now = self._hass.loop.time()
+        read_at = self._coordinator.read_at(self._device_id)
+        matches = is_noop_command(self._optimistic_changes, status)
+        expired = now - self._optimistic_since >= OPTIMISTIC_RECONCILE_WINDOW
+        # 未变化的轮询结果不会通知实体，因此窗口结束时状态一致也视为已确认
+        confirmed = matches and (
+            expired or (read_at is not None and read_at > self._optimistic_since)
+        )
+        if confirmed or expired:
+            if not confirmed:
+                _LOGGER.debug(
+                    "Optimistic state %s for %s not confirmed; rolling back.",
+                    self._optimistic_changes,
+                    self._device_id,
+                )
+            self._clear_optimistic()
+            return status
+        return self._coordinator.status(self._device_id).with_changes(
+            self._optimistic_changes
+        )
+
+    def _clear_optimistic(self):
+        self._optimistic_changes = {}
+        self._cancel_reconcile_timer()
+
+    def _cancel_reconcile_timer(self):
+        if self._unsub_reconcile:
+            self._unsub_reconcile()
+            self._unsub_reconcile = None
+
+    @callback
+    def _async_reconcile_timeout(self, _now):
+        self._unsub_reconcile = None
+        self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self):
+        self._apply_coordinator_status()
+        self._async_write_state_if_changed()
+
+    @callback
+    def _async_write_state_if_changed(self):
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._last_state_fingerprint:
+            # 派生属性未变化，跳过状态写入以免产生多余的 state_changed 事件
+            self._coordinator.stats["suppressed_state_writes"] += 1
+            return
+        self._last_state_fingerprint = fingerprint
         self.async_write_ha_state()
 
+    def _state_fingerprint(self):
+        """HA 可见状态的指纹，用于判断是否需要写入状态"""
+        return (
+            self.available,
+            self.hvac_mode,
+            self.target_temperature,
+            self.current_temperature,
+            self.fan_mode,
+            tuple(sorted(self.extra_state_attributes.items())),
+        )
+
+    @property
+    def extra_state_attributes(self):
+        # 重启后的恢复状态、或读取失败时继续展示的旧状态都会标记为 stale
+        if not self._coordinator.is_stale(self._device_id):
+            return {"stale": False}
+        age = self._coordinator.data_age(self._device_id)
+        return {
+            "stale": True,
+            "data_age": round(age) if age is not None else None,
+        }
+
     # --- 通用属性 ---
 
     @property
@@ -198,9 +264,7 @@ class PanasonicBaseEntity(ClimateEntity):
 
     @property
     def hvac_modes(self):
-        modes = [HVACMode.OFF]
-        modes.extend(k for k in self._hvac_map.keys() if k != HVACMode.OFF)
-        return modes
+        return list(self._codec.hvac_modes)
 
     @property
     def hvac_mode(self):
@@ -215,54 +279,88 @@ class PanasonicBaseEntity(ClimateEntity):
     # --- 状态获取 ---
 
     async def async_update(self):
-        await self._fetch_status(update_internal_state=True)
+        await self._fetch_status()
 
-    async def _fetch_status(self, update_internal_state=True):
-        """通用方法：获取设备当前最新状态"""
+    async def _fetch_status(self):
+        """通用方法：通过 coordinator 立即读取设备最新状态"""
         try:
-            res = await self._api.get_device_status(
-                self._profile,
-                self._usr_id,
-                self._device_id,
-                self._token,
+            return await self._coordinator.async_refresh_device(
+                self._device_id, priority=PRIORITY_COMMAND
             )
-            self._last_params = res.copy()
-            if update_internal_state:
-                self._available = True
-                self._update_local_state(res)
-            return res
         except PanasonicApiAuthError as err:
-            self._available = False
-            _LOGGER.error("Panasonic session expired for %s: %s", self._device_id, err)
             raise ConfigEntryAuthFailed("Panasonic Smart China session expired") from err
-        except PanasonicApiError as err:
-            if update_internal_state:
-                self._available = False
-            _LOGGER.debug("Fetch status failed for %s: %s", self._device_id, err)
-            return None
 
     # --- 命令发送 ---
 
     async def _send_command(self, changes):
-        """Read-Modify-Write 核心逻辑 (子类可覆盖 payload 构建)"""
+        """把指令放入设备命令队列，短时间内的多次指令会合并为一次写入"""
+        if self._optimistic:
+            self._optimistic_changes.update(changes)
+            self._optimistic_since = self._hass.loop.time()
+            self._cancel_reconcile_timer()
+            self._unsub_reconcile = async_call_later(
+                self._hass, OPTIMISTIC_RECONCILE_WINDOW, self._async_reconcile_timeout
+            )
+            self._handle_coordinator_update()
 
-        # 1. Read
-        latest_params = await self._fetch_status(update_internal_state=False)
+        self._coordinator.async_submit_command(
+            self._device_id, changes, self._async_write_and_reconcile
+        )
 
-        if latest_params:
-            current_params = latest_params.copy()
-        else:
+    async def _async_write_and_reconcile(self, changes):
+        if not await self._async_write_command(changes) and self._optimistic_changes:
+            # 写入失败：立即回滚到最近一次轮询状态
+            self._clear_optimistic()
+            self._handle_coordinator_update()
+
+    async def _async_write_command(self, changes):
+        """Read-Modify-Write 核心逻辑 (子类可覆盖 payload 构建)，返回是否写入成功"""
+
+        # 0. 会话已失效：暂存指令，待重新认证后的首次成功读取时重放
+        if self._coordinator.session_expired:
             _LOGGER.warning(
-                "Could not fetch latest status for %s; aborting command %s.",
-                self._device_id,
+                "Panasonic session expired; holding command %s for %s.",
                 changes,
+                self._device_id,
             )
-            return
+            self._coordinator.async_journal_command(self._device_id, changes)
+            return False
 
-        # 2. Build payload (委托给子类)
+        # 1. Read (固定 payload 的设备无需读取；其余设备在缓存有效期内复用最近一次轮询结果)
+        if self._profile.write_strategy == WRITE_STRATEGY_FIXED_PAYLOAD:
+            current_params = self._coordinator.status(self._device_id)
+        else:
+            try:
+                latest_params = await self._coordinator.async_get_fresh_status(
+                    self._device_id
+                )
+            except PanasonicApiAuthError:
+                # coordinator 已发起重新认证，指令暂存待重放
+                self._coordinator.async_journal_command(self._device_id, changes)
+                return False
+
+            if not latest_params:
+                _LOGGER.warning(
+                    "Could not fetch latest status for %s; aborting command %s.",
+                    self._device_id,
+                    changes,
+                )
+                return False
+            current_params = latest_params
+
+        # 2. 指令与最新已知状态一致时跳过云端写入，只刷新 HA 状态
+        #    （仅在状态足够新时判断，过期或恢复的状态可能已被面板等其他途径改变）
+        if self._coordinator.is_fresh(self._device_id) and is_noop_command(
+            changes, current_params
+        ):
+            _LOGGER.debug("Skipping no-op command %s for %s.", changes, self._device_id)
+            self._coordinator.async_skip_command(self._device_id)
+            return True
+
+        # 3. Build payload (委托给子类)
         params = self._build_send_payload(changes, current_params)
 
-        # 3. Write
+        # 4. Write
         try:
             await self._api.set_device_status(
                 self._profile,
@@ -272,20 +370,18 @@ class PanasonicBaseEntity(ClimateEntity):
                 params,
             )
         except PanasonicApiAuthError as err:
-            self._available = False
             _LOGGER.error("Panasonic session expired while setting %s: %s", self._device_id, err)
-            raise ConfigEntryAuthFailed("Panasonic Smart China session expired") from err
+            self._coordinator.session_expired = True
+            self._coordinator.async_journal_command(self._device_id, changes)
+            self._entry.async_start_reauth(self._hass)
+            return False
         except PanasonicApiError as err:
             _LOGGER.error("Set failed for %s: %s", self._device_id, err)
-            return
+            return False
 
-        # 4. 仅在服务端接受指令后更新本地状态
-        self._available = True
-        self._last_params.update(params)
-        self._update_local_state(self._last_params)
-
-        # 5. 强制通知 HA 刷新界面
-        self.async_write_ha_state()
+        # 5. 仅在服务端接受指令后更新共享状态，coordinator 会通知实体刷新界面
+        self._coordinator.async_apply_command(self._device_id, params)
+        return True
 
     # --- 子类必须实现的方法 ---
 
@@ -333,13 +429,27 @@ class PanasonicBaseEntity(ClimateEntity):
 class PanasonicACEntity(PanasonicBaseEntity):
     """松下空调实体 — 支持温度设置、风速控制"""
 
-    def __init__(self, hass, entry, config, name, profile, client):
-        super().__init__(hass, entry, config, name, profile, client)
+    def __init__(self, hass, entry, config, name, profile, coordinator):
+        super().__init__(hass, entry, config, name, profile, coordinator)
         self._sensor_id = config.get(CONF_SENSOR_ID)
         self._fan_map = profile.fan_mapping
         self._fan_overrides = profile.fan_payload_overrides
         self._fan_mode = FAN_AUTO
 
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        if self._sensor_id:
+            # 室温来自独立传感器，设备状态不变时 coordinator 不会通知，需单独订阅
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self._hass, [self._sensor_id], self._async_sensor_changed
+                )
+            )
+
+    @callback
+    def _async_sensor_changed(self, event):
+        self._async_write_state_if_changed()
+
     @property
     def supported_features(self):
         return (
@@ -351,11 +461,7 @@ class PanasonicACEntity(PanasonicBaseEntity):
 
     @property
     def fan_modes(self):
-        modes = list(self._fan_map.keys())
-        for mode in self._fan_overrides.keys():
-            if mode not in modes:
-                modes.append(mode)
-        return modes
+        return list(self._codec.fan_modes)
 
     @property
     def fan_mode(self):
@@ -374,15 +480,13 @@ class PanasonicACEntity(PanasonicBaseEntity):
         return None
 
     def _update_local_state(self, res):
-        self._is_on = (_as_int(res.get('runStatus')) == 1)
+        self._is_on = res.run_status == 1
 
-        p_mode = _as_int(res.get('runMode'))
-        for ha_mode, pm in self._hvac_map.items():
-            if pm == p_mode:
-                self._hvac_mode = ha_mode
-                break
+        hvac_mode = self._codec.decode_hvac_mode(res.run_mode)
+        if hvac_mode is not None:
+            self._hvac_mode = hvac_mode
 
-        raw_temp = _as_int(res.get('setTemperature'))
+        raw_temp = res.set_temperature
         if raw_temp is not None:
             target = raw_temp / self._temp_scale
             if self.min_temp <= target <= self.max_temp:
@@ -390,26 +494,12 @@ class PanasonicACEntity(PanasonicBaseEntity):
                 if self._is_on:
                     self._last_active_target_temperature = target
 
-        p_wind = _as_int(res.get('windSet'))
-        p_mute = _as_int(res.get('muteMode'))
-
-        if p_wind == 10 and p_mute == 1:
-            self._fan_mode = FAN_MUTE
-        else:
-            found_normal = False
-            for name, val in self._fan_map.items():
-                if val == p_wind:
-                    self._fan_mode = name
-                    found_normal = True
-                    break
-            if not found_normal:
-                self._fan_mode = FAN_AUTO
+        self._fan_mode = self._codec.decode_fan_mode(res, 'windSet') or FAN_AUTO
 
     def _build_hvac_command(self, hvac_mode):
-        p_mode = self._hvac_map.get(hvac_mode, self._hvac_map[self._default_hvac_mode])
         return {
             "runStatus": 1,
-            "runMode": p_mode,
+            "runMode": self._codec.encode_hvac_mode(hvac_mode),
             "setTemperature": int(self._last_active_target_temperature * self._temp_scale),
         }
 
@@ -417,7 +507,7 @@ class PanasonicACEntity(PanasonicBaseEntity):
         hvac_mode = self._hvac_mode if self._hvac_mode != HVACMode.OFF else self._default_hvac_mode
         return {
             "runStatus": 1,
-            "runMode": self._hvac_map.get(hvac_mode, self._hvac_map[self._default_hvac_mode]),
+            "runMode": self._codec.encode_hvac_mode(hvac_mode),
             "setTemperature": int(self._last_active_target_temperature * self._temp_scale),
         }
 
@@ -426,18 +516,14 @@ class PanasonicACEntity(PanasonicBaseEntity):
 
     def _build_send_payload(self, changes, current_params):
         """空调：Read-Modify-Write + safe_keys 过滤"""
-        current_params.update(changes)
-
-        safe_keys = self._profile.safe_status_keys
-        params = {k: v for k, v in current_params.items() if k in safe_keys}
-
-        return params
+        return self._codec.filter_write_params(current_params.with_changes(changes))
 
     async def async_set_temperature(self, **kwargs):
         temp = kwargs.get(ATTR_TEMPERATURE)
         if temp is None:
             return
-        if not self._is_on:
+        # 以合并了待写入指令的目标状态判断开关机，先开机再设温度的连续指令不会丢失温度
+        if self._coordinator.desired_status(self._device_id).run_status != 1:
             _LOGGER.info(
                 "Ignoring target temperature %.1f for %s while device is off.",
                 temp,
@@ -447,8 +533,9 @@ class PanasonicACEntity(PanasonicBaseEntity):
         await self._send_command({"setTemperature": int(temp * self._temp_scale)})
 
     async def async_set_fan_mode(self, fan_mode):
-        if fan_mode == FAN_MUTE:
-            changes = self._fan_overrides.get(FAN_MUTE, {"windSet": 10, "muteMode": 1})
+        override = self._fan_overrides.get(fan_mode)
+        if override is not None:
+            changes = dict(override)
         else:
             val = self._fan_map.get(fan_mode)
             if val is None:
@@ -474,33 +561,24 @@ class PanasonicBathroomHeaterEntity(PanasonicBaseEntity):
         return None
 
     def _update_local_state(self, res):
-        mode_value = _as_int(res.get("runningMode"), 32)
+        mode_value = res.running_mode
+        if mode_value is None:
+            mode_value = 32
         self._is_on = mode_value not in (0, 32)
 
-        for ha_mode, panasonic_mode in self._hvac_map.items():
-            if panasonic_mode == mode_value:
-                self._hvac_mode = ha_mode
-                break
+        hvac_mode = self._codec.decode_hvac_mode(mode_value)
+        if hvac_mode is not None:
+            self._hvac_mode = hvac_mode
 
         if not self._is_on:
             self._hvac_mode = HVACMode.OFF
 
     def _build_hvac_command(self, hvac_mode):
-        return {
-            "runningMode": self._hvac_map.get(
-                hvac_mode,
-                self._hvac_map[self._default_hvac_mode],
-            )
-        }
+        return {"runningMode": self._codec.encode_hvac_mode(hvac_mode)}
 
     def _build_on_command(self):
         mode = self._hvac_mode if self._hvac_mode != HVACMode.OFF else self._default_hvac_mode
-        return {
-            "runningMode": self._hvac_map.get(
-                mode,
-                self._hvac_map[self._default_hvac_mode],
-            )
-        }
+        return {"runningMode": self._codec.encode_hvac_mode(mode)}
 
     def _build_off_command(self):
         return {"runningMode": 32}
@@ -0,0 +1,96 @@
+"""Compiled status codecs for Panasonic device profiles."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant.components.climate.const import HVACMode
+
+from .models import PanasonicProfile
+
+
+def as_int(value, default=None):
+    """Best-effort int conversion for Panasonic status fields."""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class ProfileCodec:
+    """Lookup tables derived once from a profile's mappings.
+
+    Decoding a status value is a dict lookup instead of a scan over the
+    profile mappings, and write payloads are filtered with a prebuilt key
+    tuple.
+    """
+
+    profile: PanasonicProfile
+    hvac_modes: tuple[Any, ...]
+    hvac_by_value: Mapping[int, Any]
+    fan_modes: tuple[str, ...]
+    fan_by_value: Mapping[int, str]
+    fan_overrides: tuple[tuple[str, tuple[tuple[str, int], ...]], ...]
+    write_keys: tuple[str, ...]
+
+    def decode_hvac_mode(self, value) -> Any | None:
+        """Return the HA hvac mode of a raw mode value, if it is mapped."""
+        return self.hvac_by_value.get(as_int(value))
+
+    def encode_hvac_mode(self, hvac_mode) -> int:
+        """Return the raw value of an hvac mode, falling back to the default."""
+        mapping = self.profile.hvac_mapping
+        return mapping.get(hvac_mode, mapping[self.profile.default_hvac_mode])
+
+    def decode_fan_mode(self, status: Mapping[str, Any], fan_key: str) -> str | None:
+        """Return the fan mode of a status payload.
+
+        Payload overrides (e.g. quiet mode) are matched first since they
+        share their fan value with a regular mode.
+        """
+        for fan_mode, fields in self.fan_overrides:
+            if all(as_int(status.get(key)) == value for key, value in fields):
+                return fan_mode
+        return self.fan_by_value.get(as_int(status.get(fan_key)))
+
+    def filter_write_params(self, params: Mapping[str, Any]) -> dict[str, Any]:
+        """Keep only the status keys the set endpoint accepts."""
+        return {key: params[key] for key in self.write_keys if key in params}
+
+
+def compile_profile(profile: PanasonicProfile) -> ProfileCodec:
+    """Build the codec of a profile."""
+    hvac_by_value: dict[int, Any] = {}
+    for hvac_mode, value in profile.hvac_mapping.items():
+        # First mapping wins, like the scans this replaces.
+        hvac_by_value.setdefault(value, hvac_mode)
+    fan_by_value: dict[int, str] = {}
+    for fan_mode, value in profile.fan_mapping.items():
+        fan_by_value.setdefault(value, fan_mode)
+
+    return ProfileCodec(
+        profile=profile,
+        hvac_modes=(
+            HVACMode.OFF,
+            *(mode for mode in profile.hvac_mapping if mode != HVACMode.OFF),
+        ),
+        hvac_by_value=MappingProxyType(hvac_by_value),
+        fan_modes=tuple(
+            dict.fromkeys([*profile.fan_mapping, *profile.fan_payload_overrides])
+        ),
+        fan_by_value=MappingProxyType(fan_by_value),
+        fan_overrides=tuple(
+            (
+                fan_mode,
+                tuple((key, as_int(value)) for key, value in payload.items()),
+            )
+            for fan_mode, payload in profile.fan_payload_overrides.items()
+        ),
+        write_keys=tuple(sorted(profile.safe_status_keys)),
+    )
@@ -0,0 +1,151 @@
+"""Per-device command coalescing for Panasonic Smart China."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMAND_COALESCE_WINDOW = 0.3
+# Commands held while the session is expired: at most this many per device,
+# each dropped once older than the TTL (seconds).
+COMMAND_JOURNAL_MAX_ENTRIES = 20
+COMMAND_JOURNAL_TTL = 600.0
+
+CommandWriter = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+def _same_value(left: Any, right: Any) -> bool:
+    """Compare status values that the cloud may return as str or int."""
+    if left == right:
+        return True
+    try:
+        return int(left) == int(right)
+    except (TypeError, ValueError):
+        return False
+
+
+def is_noop_command(changes: dict[str, Any], status: dict[str, Any] | None) -> bool:
+    """Return whether every commanded field already has the commanded value."""
+    if not status:
+        return False
+    return all(
+        key in status and _same_value(status[key], value)
+        for key, value in changes.items()
+    )
+
+
+class DeviceCommandQueue:
+    """Merge commands for one device and write them one batch at a time.
+
+    Changes submitted within the coalescing window (or while the previous
+    batch is still being written) are merged last-write-wins per field and
+    handed to the writer as a single command. Batches of one device never
+    run concurrently.
+    """
+
+    def __init__(
+        self,
+        device_id: str,
+        writer: CommandWriter,
+        window: float = COMMAND_COALESCE_WINDOW,
+    ) -> None:
+        self.device_id = device_id
+        self._writer = writer
+        self._window = window
+        self._write_lock = asyncio.Lock()
+        self._pending: dict[str, Any] | None = None
+        self._writing: dict[str, Any] | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> dict[str, Any] | None:
+        """Changes waiting to be written, if any."""
+        return self._pending
+
+    @property
+    def desired(self) -> dict[str, Any]:
+        """Changes being written or waiting to be, merged in submit order."""
+        return {**(self._writing or {}), **(self._pending or {})}
+
+    def submit(self, changes: dict[str, Any]) -> None:
+        """Queue changes; a flush is scheduled for the first change of a batch."""
+        if self._pending is not None:
+            self._pending.update(changes)
+            return
+
+        self._pending = dict(changes)
+        task = asyncio.ensure_future(self._async_flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _async_flush(self) -> None:
+        await asyncio.sleep(self._window)
+        async with self._write_lock:
+            # Take the batch only once the previous write is done, so changes
+            # arriving meanwhile are merged into it as well.
+            changes, self._pending = self._pending, None
+            if not changes:
+                return
+            self._writing = changes
+            try:
+                await self._writer(changes)
+            except Exception:  # noqa: BLE001 - background task, log and move on
+                _LOGGER.exception(
+                    "Unexpected error writing command %s to %s",
+                    changes,
+                    self.device_id,
+                )
+            finally:
+                self._writing = None
+
+    def cancel(self) -> None:
+        """Drop queued changes and cancel scheduled flushes."""
+        self._pending = None
+        for task in list(self._flush_tasks):
+            task.cancel()
+
+
+class CommandJournal:
+    """Commands held back while the account session is expired.
+
+    Entries are kept per device in arrival order, bounded to ``max_entries``
+    (oldest dropped first). Taking a device's entries merges the unexpired
+    ones last-write-wins into the latest desired state.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = COMMAND_JOURNAL_MAX_ENTRIES,
+        ttl: float = COMMAND_JOURNAL_TTL,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: dict[str, deque[tuple[float, dict[str, Any]]]] = {}
+
+    def record(self, device_id: str, changes: dict[str, Any], now: float) -> None:
+        entries = self._entries.get(device_id)
+        if entries is None:
+            entries = self._entries[device_id] = deque(maxlen=self._max_entries)
+        entries.append((now, dict(changes)))
+
+    def take(self, device_id: str, now: float) -> dict[str, Any] | None:
+        """Remove a device's entries and return their merged unexpired changes."""
+        entries = self._entries.pop(device_id, None)
+        if not entries:
+            return None
+        changes: dict[str, Any] = {}
+        for recorded_at, entry_changes in entries:
+            if now - recorded_at <= self._ttl:
+                changes.update(entry_changes)
+        return changes or None
+
+    def __contains__(self, device_id: str) -> bool:
+        return device_id in self._entries
+
+    def as_dict(self) -> dict[str, int]:
+        return {device_id: len(entries) for device_id, entries in self._entries.items()}
@@ -18,9 +18,16 @@ from homeassistant.helpers.selector import (
     SelectSelectorMode,
 )
 
-from .api import PanasonicApiAuthError, PanasonicApiClient, PanasonicApiError
+from .api import (
+    PanasonicApiAuthError,
+    PanasonicApiClient,
+    PanasonicApiError,
+    login_digest,
+)
 from .const import (
+    CONF_AUTO_RELOGIN,
     CONF_CATEGORY,
+    CONF_CONNECTION_POOL_SIZE,
     CONF_CONTROLLER_MODEL,
     CONF_DEVICE_ID,
     CONF_DEVICE_MODEL,
@@ -29,14 +36,36 @@ from .const import (
     CONF_ENABLED,
     CONF_ENTITY_KIND,
     CONF_FAMILY_ID,
+    CONF_FAST_POLL_INTERVAL,
     CONF_HA_PLATFORMS,
+    CONF_HEDGE_STATUS_READS,
+    CONF_IDLE_POLL_INTERVAL,
+    CONF_LOGIN_DIGEST,
+    CONF_OPTIMISTIC_UPDATES,
+    CONF_POLL_INTERVAL,
     CONF_PROFILE_ID,
     CONF_REAL_FAMILY_ID,
+    CONF_REQUEST_TIMEOUT_MAX,
+    CONF_REQUEST_TIMEOUT_MIN,
     CONF_SENSOR_ID,
     CONF_SSID,
+    CONF_STALE_MAX_AGE,
+    CONF_STALE_MAX_FAILURES,
+    CONF_STATUS_CACHE_TTL,
     CONF_TOKEN,
     CONF_USERNAME,
     CONF_USR_ID,
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_HEDGE_STATUS_READS,
+    DEFAULT_IDLE_POLL_INTERVAL,
+    DEFAULT_OPTIMISTIC_UPDATES,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REQUEST_TIMEOUT_MAX,
+    DEFAULT_REQUEST_TIMEOUT_MIN,
+    DEFAULT_STALE_MAX_AGE,
+    DEFAULT_STALE_MAX_FAILURES,
+    DEFAULT_STATUS_CACHE_TTL,
     DOMAIN,
     extract_category_from_device_id,
     find_controllers_for_category,
@@ -47,6 +76,7 @@ from .token import DeviceTokenError, generate_device_token
 
 _LOGGER = logging.getLogger(__name__)
 RESCAN_DEVICES = "__rescan_devices__"
+ACCOUNT_SETTINGS = "__account_settings__"
 MODEL_FIELD_CANDIDATES = (
     "devSubTypeId",
     "devType",
@@ -68,6 +98,7 @@ class PanasonicConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._ssid: str | None = None
         self._family_id: str | None = None
         self._real_family_id: str | None = None
+        self._login_digest: str | None = None
         self._devices: dict[str, dict[str, Any]] = {}
         self._device_support_map: dict[str, dict[str, Any]] = {}
 
@@ -93,6 +124,10 @@ class PanasonicConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self._ssid = login.ssid
                 self._family_id = login.family_id
                 self._real_family_id = login.real_family_id
+                if user_input.get(CONF_AUTO_RELOGIN):
+                    self._login_digest = login_digest(
+                        user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
+                    )
                 self._devices = login.devices
                 self._analyze_device_support()
 
@@ -107,6 +142,7 @@ class PanasonicConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 {
                     vol.Required(CONF_USERNAME): str,
                     vol.Required(CONF_PASSWORD): str,
+                    vol.Optional(CONF_AUTO_RELOGIN, default=False): bool,
                 }
             ),
             errors=errors,
@@ -135,16 +171,19 @@ class PanasonicConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 if not configured_devices:
                     errors["base"] = "no_devices_selected"
                 else:
+                    data = {
+                        CONF_USERNAME: self._username,
+                        CONF_USR_ID: self._usr_id,
+                        CONF_SSID: self._ssid,
+                        CONF_FAMILY_ID: self._family_id,
+                        CONF_REAL_FAMILY_ID: self._real_family_id,
+                        CONF_DEVICES: configured_devices,
+                    }
+                    if self._login_digest:
+                        data[CONF_LOGIN_DIGEST] = self._login_digest
                     return self.async_create_entry(
                         title=f"松下账号 ({self._username})",
-                        data={
-                            CONF_USERNAME: self._username,
-                            CONF_USR_ID: self._usr_id,
-                            CONF_SSID: self._ssid,
-                            CONF_FAMILY_ID: self._family_id,
-                            CONF_REAL_FAMILY_ID: self._real_family_id,
-                            CONF_DEVICES: configured_devices,
-                        },
+                        data=data,
                     )
 
         options = [
@@ -207,11 +246,25 @@ class PanasonicConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 new_data[CONF_SSID] = login.ssid
                 new_data[CONF_FAMILY_ID] = login.family_id
                 new_data[CONF_REAL_FAMILY_ID] = login.real_family_id
+                if user_input.get(CONF_AUTO_RELOGIN):
+                    new_data[CONF_LOGIN_DIGEST] = login_digest(
+                        self._username, user_input[CONF_PASSWORD]
+                    )
+                else:
+                    new_data.pop(CONF_LOGIN_DIGEST, None)
                 return self.async_update_reload_and_abort(reauth_entry, data=new_data)
 
         return self.async_show_form(
             step_id="reauth_confirm",
-            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_PASSWORD): str,
+                    vol.Optional(
+                        CONF_AUTO_RELOGIN,
+                        default=CONF_LOGIN_DIGEST in self._get_reauth_entry().data,
+                    ): bool,
+                }
+            ),
             errors=errors,
         )
 
@@ -324,10 +377,13 @@ class PanasonicOptionsFlow(config_entries.OptionsFlow):
             self._selected_device_id = user_input[CONF_DEVICE_ID]
             if self._selected_device_id == RESCAN_DEVICES:
                 return await self.async_step_rescan()
+            if self._selected_device_id == ACCOUNT_SETTINGS:
+                return await self.async_step_settings()
             return await self.async_step_edit_device()
 
         device_options = {
             RESCAN_DEVICES: "重新扫描账号设备",
+            ACCOUNT_SETTINGS: "账号高级设置",
             **{
                 device_id: _format_device_label(
                     info.get(CONF_DEVICE_NAME, device_id),
@@ -442,7 +498,7 @@ class PanasonicOptionsFlow(config_entries.OptionsFlow):
             self.hass.config_entries.async_update_entry(self._config_entry, data=new_data)
             await self.hass.config_entries.async_reload(self._config_entry.entry_id)
             _LOGGER.info("Device rescan completed, added %s new supported devices.", added)
-            return self.async_create_entry(title="", data={})
+            return self.async_create_entry(title="", data=dict(self._config_entry.options))
 
         return self.async_show_form(
             step_id="rescan",
@@ -450,6 +506,100 @@ class PanasonicOptionsFlow(config_entries.OptionsFlow):
             errors=errors,
         )
 
+    async def async_step_settings(self, user_input=None):
+        """Edit account-level polling settings."""
+        options = dict(self._config_entry.options)
+        errors = {}
+
+        if user_input is not None:
+            options.update(user_input)
+            if not (
+                options[CONF_FAST_POLL_INTERVAL]
+                <= options[CONF_POLL_INTERVAL]
+                <= options[CONF_IDLE_POLL_INTERVAL]
+            ):
+                errors["base"] = "invalid_poll_intervals"
+            elif options[CONF_REQUEST_TIMEOUT_MIN] > options[CONF_REQUEST_TIMEOUT_MAX]:
+                errors["base"] = "invalid_request_timeouts"
+            else:
+                self.hass.config_entries.async_update_entry(
+                    self._config_entry,
+                    options=options,
+                )
+                await self.hass.config_entries.async_reload(self._config_entry.entry_id)
+                return self.async_create_entry(title="", data=options)
+
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_FAST_POLL_INTERVAL,
+                        default=options.get(
+                            CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                    vol.Required(
+                        CONF_POLL_INTERVAL,
+                        default=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=600)),
+                    vol.Required(
+                        CONF_IDLE_POLL_INTERVAL,
+                        default=options.get(
+                            CONF_IDLE_POLL_INTERVAL, DEFAULT_IDLE_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Required(
+                        CONF_CONNECTION_POOL_SIZE,
+                        default=options.get(
+                            CONF_CONNECTION_POOL_SIZE, DEFAULT_CONNECTION_POOL_SIZE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                    vol.Required(
+                        CONF_STATUS_CACHE_TTL,
+                        default=options.get(
+                            CONF_STATUS_CACHE_TTL, DEFAULT_STATUS_CACHE_TTL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
+                    vol.Required(
+                        CONF_OPTIMISTIC_UPDATES,
+                        default=options.get(
+                            CONF_OPTIMISTIC_UPDATES, DEFAULT_OPTIMISTIC_UPDATES
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_STALE_MAX_FAILURES,
+                        default=options.get(
+                            CONF_STALE_MAX_FAILURES, DEFAULT_STALE_MAX_FAILURES
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                    vol.Required(
+                        CONF_STALE_MAX_AGE,
+                        default=options.get(CONF_STALE_MAX_AGE, DEFAULT_STALE_MAX_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                    vol.Required(
+                        CONF_HEDGE_STATUS_READS,
+                        default=options.get(
+                            CONF_HEDGE_STATUS_READS, DEFAULT_HEDGE_STATUS_READS
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_REQUEST_TIMEOUT_MIN,
+                        default=options.get(
+                            CONF_REQUEST_TIMEOUT_MIN, DEFAULT_REQUEST_TIMEOUT_MIN
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                    vol.Required(
+                        CONF_REQUEST_TIMEOUT_MAX,
+                        default=options.get(
+                            CONF_REQUEST_TIMEOUT_MAX, DEFAULT_REQUEST_TIMEOUT_MAX
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+                }
+            ),
+            errors=errors,
+        )
+
     async def async_step_edit_device(self, user_input=None):
         """Edit a single device under the account entry."""
         devices = dict(self._config_entry.data.get(CONF_DEVICES, {}))
@@ -465,7 +615,7 @@ class PanasonicOptionsFlow(config_entries.OptionsFlow):
             new_data[CONF_DEVICES] = devices
             self.hass.config_entries.async_update_entry(self._config_entry, data=new_data)
             await self.hass.config_entries.async_reload(self._config_entry.entry_id)
-            return self.async_create_entry(title="", data={})
+            return self.async_create_entry(title="", data=dict(self._config_entry.options))
 
         schema = {
             vol.Required(CONF_ENABLED, default=current.get(CONF_ENABLED, True)): bool,
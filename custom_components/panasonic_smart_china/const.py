@@ -24,6 +24,33 @@ CONF_ENABLED = "enabled"
 CONF_PROFILE_ID = "profile_id"
 CONF_HA_PLATFORMS = "ha_platforms"
 CONF_ENTITY_KIND = "entity_kind"
+CONF_AUTO_RELOGIN = "auto_relogin"
+CONF_LOGIN_DIGEST = "login_digest"
+
+# 账号级轮询设置（保存在 entry.options 中）
+CONF_FAST_POLL_INTERVAL = "fast_poll_interval"
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_IDLE_POLL_INTERVAL = "idle_poll_interval"
+CONF_CONNECTION_POOL_SIZE = "connection_pool_size"
+CONF_STATUS_CACHE_TTL = "status_cache_ttl"
+CONF_OPTIMISTIC_UPDATES = "optimistic_updates"
+CONF_STALE_MAX_FAILURES = "stale_max_failures"
+CONF_STALE_MAX_AGE = "stale_max_age"
+CONF_HEDGE_STATUS_READS = "hedge_status_reads"
+CONF_REQUEST_TIMEOUT_MIN = "request_timeout_min"
+CONF_REQUEST_TIMEOUT_MAX = "request_timeout_max"
+
+DEFAULT_FAST_POLL_INTERVAL = 3
+DEFAULT_POLL_INTERVAL = 15
+DEFAULT_IDLE_POLL_INTERVAL = 120
+DEFAULT_CONNECTION_POOL_SIZE = 4
+DEFAULT_STATUS_CACHE_TTL = 5
+DEFAULT_OPTIMISTIC_UPDATES = False
+DEFAULT_STALE_MAX_FAILURES = 3
+DEFAULT_STALE_MAX_AGE = 300
+DEFAULT_HEDGE_STATUS_READS = False
+DEFAULT_REQUEST_TIMEOUT_MIN = 3
+DEFAULT_REQUEST_TIMEOUT_MAX = 30
 
 
 def find_controllers_for_category(category_id):
@@ -0,0 +1,574 @@
+"""Account-level status coordinator for Panasonic Smart China."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import random
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    PanasonicApiAuthError,
+    PanasonicApiClient,
+    PanasonicApiError,
+)
+from .commands import CommandJournal, CommandWriter, DeviceCommandQueue
+from .const import (
+    CONF_CATEGORY,
+    CONF_CONNECTION_POOL_SIZE,
+    CONF_CONTROLLER_MODEL,
+    CONF_DEVICE_ID,
+    CONF_DEVICE_NAME,
+    CONF_DEVICES,
+    CONF_ENABLED,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_IDLE_POLL_INTERVAL,
+    CONF_POLL_INTERVAL,
+    CONF_PROFILE_ID,
+    CONF_STALE_MAX_AGE,
+    CONF_STALE_MAX_FAILURES,
+    CONF_STATUS_CACHE_TTL,
+    CONF_TOKEN,
+    CONF_USR_ID,
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_IDLE_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_STALE_MAX_AGE,
+    DEFAULT_STALE_MAX_FAILURES,
+    DEFAULT_STATUS_CACHE_TTL,
+    DOMAIN,
+)
+from .models import PanasonicProfile
+from .profiles import find_profile_for_device_config
+from .scheduler import AdaptivePollScheduler
+from .status import StatusSnapshot, status_snapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+# === 轮询频率 ===
+# 调度器按设备决定实际轮询间隔，这里只是检查到期设备的节拍
+SCHEDULER_TICK = timedelta(seconds=1)
+# 启动时最多等待首轮读取的时间，超时的设备在后台读取完成后再变为可用
+INITIAL_REFRESH_TIMEOUT = 5.0
+# 多个账号同时启动时错开首轮读取
+STARTUP_JITTER = 2.0
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+COMMAND_JOURNALS_KEY = f"{DOMAIN}_command_journals"
+
+
+def status_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the last known status of an entry's devices."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.status")
+
+
+@callback
+def async_get_command_journal(hass: HomeAssistant, entry_id: str) -> CommandJournal:
+    """Return the entry's command journal, kept across entry reloads."""
+    journals = hass.data.setdefault(COMMAND_JOURNALS_KEY, {})
+    journal = journals.get(entry_id)
+    if journal is None:
+        journal = journals[entry_id] = CommandJournal()
+    return journal
+
+
+@dataclass(frozen=True)
+class PanasonicDevice:
+    """Enabled account device resolved to its profile."""
+
+    device_id: str
+    name: str
+    profile: PanasonicProfile
+    config: dict[str, Any]
+
+    @property
+    def usr_id(self) -> str:
+        return self.config[CONF_USR_ID]
+
+    @property
+    def token(self) -> str:
+        return self.config[CONF_TOKEN]
+
+
+def resolve_entry_devices(entry: ConfigEntry) -> dict[str, PanasonicDevice]:
+    """Return enabled devices of an account entry that map to a known profile."""
+    devices = {}
+    for device_id, device_config in entry.data.get(CONF_DEVICES, {}).items():
+        if not device_config.get(CONF_ENABLED, True):
+            continue
+
+        profile = find_profile_for_device_config(
+            profile_id=device_config.get(CONF_PROFILE_ID),
+            controller_model=device_config.get(CONF_CONTROLLER_MODEL),
+            category_id=device_config.get(CONF_CATEGORY),
+        )
+        if not profile:
+            _LOGGER.error("Device profile not found for %s.", device_id)
+            continue
+
+        devices[device_id] = PanasonicDevice(
+            device_id=device_id,
+            name=device_config.get(CONF_DEVICE_NAME, device_id),
+            profile=profile,
+            config={
+                **entry.data,
+                **device_config,
+                CONF_DEVICE_ID: device_id,
+            },
+        )
+    return devices
+
+
+class PanasonicStatusCoordinator:
+    """Poll every enabled device of one account and fan status out to entities."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: PanasonicApiClient,
+    ) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.client = client
+        self.devices = resolve_entry_devices(entry)
+        self.data: dict[str, StatusSnapshot] = {}
+        self.stats: Counter[str] = Counter()
+        self._available: dict[str, bool] = {}
+        self._read_at: dict[str, float] = {}
+        self._restored: set[str] = set()
+        self._good_at: dict[str, float] = {}
+        # 最近一次成功读取的 UTC 时间戳，随状态一起持久化，重启后据此计算数据时长
+        self._read_timestamps: dict[str, float] = {}
+        self._store = status_store(hass, entry.entry_id)
+        self._save_scheduled = False
+        self._command_queues: dict[str, DeviceCommandQueue] = {}
+        self._command_writers: dict[str, CommandWriter] = {}
+        # 会话失效期间的指令暂存于此，重新认证（会重载 entry）后仍然保留
+        self.journal = async_get_command_journal(hass, entry.entry_id)
+        self.session_expired = False
+        self._listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._polls_in_flight: set[str] = set()
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        self._initial_refresh_task: asyncio.Task | None = None
+
+        options = entry.options
+        # 并发轮询数与连接池大小一致，避免请求在连接池中排队
+        self._poll_semaphore = asyncio.Semaphore(
+            options.get(CONF_CONNECTION_POOL_SIZE, DEFAULT_CONNECTION_POOL_SIZE)
+        )
+        self.scheduler = AdaptivePollScheduler(
+            fast_interval=options.get(CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL),
+            interval=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+            idle_interval=options.get(CONF_IDLE_POLL_INTERVAL, DEFAULT_IDLE_POLL_INTERVAL),
+        )
+        self._status_cache_ttl = options.get(
+            CONF_STATUS_CACHE_TTL, DEFAULT_STATUS_CACHE_TTL
+        )
+        self._stale_max_failures = options.get(
+            CONF_STALE_MAX_FAILURES, DEFAULT_STALE_MAX_FAILURES
+        )
+        self._stale_max_age = options.get(CONF_STALE_MAX_AGE, DEFAULT_STALE_MAX_AGE)
+        now = hass.loop.time()
+        for device_id in self.devices:
+            self.scheduler.register(device_id, now)
+
+    # --- 订阅管理 ---
+
+    @callback
+    def async_add_listener(
+        self, device_id: str, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Subscribe to status updates of one device."""
+        listeners = self._listeners.setdefault(device_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self, device_id: str) -> None:
+        for update_callback in list(self._listeners.get(device_id, ())):
+            update_callback()
+
+    def status(self, device_id: str) -> StatusSnapshot:
+        """Return the known status of a device, empty if none was read yet."""
+        status = self.data.get(device_id)
+        if status is None:
+            status = status_snapshot(self.devices[device_id].profile.protocol, {})
+        return status
+
+    def read_at(self, device_id: str) -> float | None:
+        """Return the loop time of the last successful status read."""
+        return self._read_at.get(device_id)
+
+    def is_stale(self, device_id: str) -> bool:
+        """Return whether the served status is restored or its last poll failed."""
+        return (
+            device_id in self._restored
+            or self.scheduler.state(device_id).failures > 0
+        )
+
+    def is_fresh(self, device_id: str) -> bool:
+        """Return whether the status was read live within the cache TTL."""
+        read_at = self._read_at.get(device_id)
+        return (
+            device_id in self.data
+            and read_at is not None
+            and self.hass.loop.time() - read_at <= self._status_cache_ttl
+            and not self.is_stale(device_id)
+        )
+
+    def is_available(self, device_id: str) -> bool:
+        """Return whether the last status read of a device succeeded."""
+        return self._available.get(device_id, False)
+
+    # --- 轮询周期 ---
+
+    @callback
+    def async_start(self) -> None:
+        """Start the shared scheduler tick."""
+        if self._unsub_refresh is None:
+            self._unsub_refresh = async_track_time_interval(
+                self.hass, self._async_handle_tick, SCHEDULER_TICK
+            )
+
+    async def async_shutdown(self) -> None:
+        """Stop polling, save pending status and drop all listeners."""
+        if self._unsub_refresh:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+        if self._initial_refresh_task and not self._initial_refresh_task.done():
+            self._initial_refresh_task.cancel()
+        for queue in self._command_queues.values():
+            queue.cancel()
+        self._listeners.clear()
+        if self._save_scheduled:
+            # Write now instead of after the delay: a reloaded coordinator must
+            # restore the latest status, and a removed entry's file must not be
+            # written back by this instance's pending save.
+            self._save_scheduled = False
+            await self._store.async_save(self._data_to_store())
+
+    async def _async_handle_tick(self, now) -> None:
+        due = [
+            device_id
+            for device_id in self.scheduler.due(self.hass.loop.time())
+            if device_id not in self._polls_in_flight
+        ]
+        if due:
+            await self._async_poll_devices(due)
+
+    async def async_restore(self) -> None:
+        """Load the last known status of each device saved before a restart."""
+        stored = await self._store.async_load() or {}
+        read_timestamps = stored.get("read_at", {})
+        for device_id, status in stored.get("devices", {}).items():
+            if device_id in self.devices and isinstance(status, dict):
+                self.data[device_id] = status_snapshot(
+                    self.devices[device_id].profile.protocol, status
+                )
+                self._restored.add(device_id)
+                read_timestamp = read_timestamps.get(device_id)
+                if not isinstance(read_timestamp, (int, float)):
+                    # Saved without a read time: age unknown, show it unavailable.
+                    self._available[device_id] = False
+                    continue
+                age = max(0.0, dt_util.utcnow().timestamp() - read_timestamp)
+                self._read_timestamps[device_id] = read_timestamp
+                self._good_at[device_id] = self.hass.loop.time() - age
+                self._available[device_id] = age <= self._stale_max_age
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._save_scheduled = True
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        return {
+            "devices": {
+                device_id: dict(status) for device_id, status in self.data.items()
+            },
+            "read_at": dict(self._read_timestamps),
+        }
+
+    async def async_initial_refresh(
+        self, timeout: float = INITIAL_REFRESH_TIMEOUT
+    ) -> None:
+        """Start the first read of every device and wait for it up to a timeout.
+
+        Devices that have not answered in time keep being read in the
+        background and become available once their status lands.
+        """
+        self._initial_refresh_task = self.hass.async_create_background_task(
+            self._async_jittered_refresh(),
+            f"{DOMAIN} initial refresh {self.entry.entry_id}",
+        )
+        done, _ = await asyncio.wait({self._initial_refresh_task}, timeout=timeout)
+        if not done:
+            pending = [
+                device_id for device_id in self.devices if device_id not in self.data
+            ]
+            _LOGGER.debug(
+                "Initial refresh of %s still waiting on %s; continuing setup.",
+                self.entry.title,
+                pending,
+            )
+
+    async def _async_jittered_refresh(self) -> None:
+        await asyncio.sleep(random.uniform(0, STARTUP_JITTER))
+        await self.async_refresh()
+
+    async def async_refresh(self) -> None:
+        """Poll every device now, skipping devices whose poll is still running."""
+        await self._async_poll_devices(
+            [
+                device_id
+                for device_id in self.devices
+                if device_id not in self._polls_in_flight
+            ]
+        )
+
+    async def _async_poll_devices(self, device_ids: list[str]) -> None:
+        # 先登记在途设备，避免云端变慢时下一个节拍重复发起同一设备的轮询
+        self._polls_in_flight.update(device_ids)
+        await asyncio.gather(
+            *(self._async_poll_device(device_id) for device_id in device_ids)
+        )
+
+    async def _async_poll_device(self, device_id: str) -> None:
+        try:
+            async with self._poll_semaphore:
+                await self.async_refresh_device(device_id)
+        except PanasonicApiAuthError:
+            # Reauth has already been requested for the entry.
+            pass
+        finally:
+            self._polls_in_flight.discard(device_id)
+
+    async def async_refresh_device(
+        self,
+        device_id: str,
+        *,
+        mark_failure: bool = True,
+        priority: int = PRIORITY_POLL,
+    ) -> StatusSnapshot | None:
+        """Read one device now and publish the result to its listeners.
+
+        Auth errors are re-raised after requesting reauth so command paths can
+        surface them; other API errors return None.
+        """
+        device = self.devices[device_id]
+        try:
+            status = await self.client.get_device_status(
+                device.profile,
+                device.usr_id,
+                device.device_id,
+                device.token,
+                priority=priority,
+            )
+        except PanasonicApiAuthError as err:
+            _LOGGER.error("Panasonic session expired for %s: %s", device_id, err)
+            self.session_expired = True
+            self.scheduler.record_failure(device_id, self.hass.loop.time())
+            self._async_set_failed(device_id)
+            self.entry.async_start_reauth(self.hass)
+            raise
+        except PanasonicApiError as err:
+            _LOGGER.debug("Fetch status failed for %s: %s", device_id, err)
+            if mark_failure:
+                self.scheduler.record_failure(device_id, self.hass.loop.time())
+                self._async_set_failed(device_id)
+            return None
+
+        unchanged = (
+            self._available.get(device_id, False)
+            and not self.is_stale(device_id)
+            and self.data.get(device_id) == status
+        )
+        self.scheduler.record_success(
+            device_id, device.profile, status, self.hass.loop.time()
+        )
+        self.data[device_id] = status
+        self._read_at[device_id] = self._good_at[device_id] = self.hass.loop.time()
+        self._read_timestamps[device_id] = dt_util.utcnow().timestamp()
+        self._available[device_id] = True
+        self._restored.discard(device_id)
+        self.session_expired = False
+        self._async_replay_journal(device_id)
+        if unchanged:
+            # Same raw status as before: listeners have nothing new to show.
+            self.stats["unchanged_status_reads"] += 1
+        else:
+            self._async_schedule_save()
+            self._async_notify(device_id)
+        return status
+
+    async def async_get_fresh_status(self, device_id: str) -> StatusSnapshot | None:
+        """Return the cached status if it was read within the TTL, else read it.
+
+        Used by the read-modify-write command path; hit/miss counts are kept in
+        ``stats`` for tuning the TTL.
+        """
+        if self.is_fresh(device_id):
+            self.stats["status_cache_hits"] += 1
+            return self.data[device_id]
+        self.stats["status_cache_misses"] += 1
+        return await self.async_refresh_device(
+            device_id, mark_failure=False, priority=PRIORITY_COMMAND
+        )
+
+    @callback
+    def _async_set_failed(self, device_id: str) -> None:
+        """Apply the stale-while-error policy after a failed poll.
+
+        The last good status keeps being served (flagged stale) until the
+        device has failed ``stale_max_failures`` polls in a row or the data is
+        older than ``stale_max_age`` seconds, whichever comes first.
+        """
+        failures = self.scheduler.state(device_id).failures
+        age = self.data_age(device_id)
+        self._available[device_id] = (
+            device_id in self.data
+            and failures < self._stale_max_failures
+            and age is not None
+            and age <= self._stale_max_age
+        )
+        self._async_notify(device_id)
+
+    def data_age(self, device_id: str) -> float | None:
+        """Return seconds since the device's status was last read or restored."""
+        good_at = self._good_at.get(device_id)
+        if good_at is None:
+            return None
+        return self.hass.loop.time() - good_at
+
+    @callback
+    def async_submit_command(
+        self, device_id: str, changes: dict[str, Any], writer: CommandWriter
+    ) -> None:
+        """Queue a command; commands to one device are merged and serialized."""
+        queue = self._command_queues.get(device_id)
+        if queue is None:
+            queue = self._command_queues[device_id] = DeviceCommandQueue(
+                device_id, writer
+            )
+        queue.submit(changes)
+
+    def desired_status(self, device_id: str) -> StatusSnapshot:
+        """Return the known status with queued and in-flight commands applied."""
+        status = self.status(device_id)
+        queue = self._command_queues.get(device_id)
+        if queue is None:
+            return status
+        return status.with_changes(queue.desired)
+
+    @callback
+    def async_register_writer(
+        self, device_id: str, writer: CommandWriter
+    ) -> Callable[[], None]:
+        """Register the writer that replays journaled commands of a device."""
+        self._command_writers[device_id] = writer
+        if device_id in self._read_at:
+            self._async_replay_journal(device_id)
+
+        @callback
+        def remove_writer() -> None:
+            if self._command_writers.get(device_id) is writer:
+                del self._command_writers[device_id]
+
+        return remove_writer
+
+    @callback
+    def async_journal_command(self, device_id: str, changes: dict[str, Any]) -> None:
+        """Hold a command that could not be written until the session is valid."""
+        self.journal.record(device_id, changes, self.hass.loop.time())
+        self.stats["journaled_commands"] += 1
+
+    @callback
+    def _async_replay_journal(self, device_id: str) -> None:
+        """Queue journaled commands once a read proved the session valid."""
+        writer = self._command_writers.get(device_id)
+        if writer is None or device_id not in self.journal:
+            return
+        changes = self.journal.take(device_id, self.hass.loop.time())
+        if not changes:
+            return
+        _LOGGER.info("Replaying command %s held for %s", changes, device_id)
+        self.stats["replayed_commands"] += 1
+        self.async_submit_command(device_id, changes, writer)
+
+    @callback
+    def async_skip_command(self, device_id: str) -> None:
+        """Record a command skipped as a no-op and refresh its listeners."""
+        self.stats["skipped_writes"] += 1
+        self._async_notify(device_id)
+
+    @callback
+    def async_apply_command(self, device_id: str, params: dict[str, Any]) -> None:
+        """Merge params accepted by the cloud into the cached device status."""
+        self.data[device_id] = self.status(device_id).with_changes(params)
+        self._available[device_id] = True
+        self._async_schedule_save()
+        self.scheduler.boost(device_id, self.hass.loop.time())
+        self._async_notify(device_id)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return runtime state for config entry diagnostics."""
+        now = self.hass.loop.time()
+        return {
+            "stats": dict(self.stats),
+            "session_expired": self.session_expired,
+            "command_journal": self.journal.as_dict(),
+            "rate_limiter": self.client.rate_limiter.as_dict(),
+            "circuit_breakers": {
+                path: breaker.as_dict()
+                for path, breaker in self.client.circuit_breakers.items()
+            },
+            "latency": {
+                path: {
+                    **tracker.as_dict(),
+                    "timeout": round(self.client.request_timeout(path), 2),
+                }
+                for path, tracker in self.client.latency_trackers.items()
+            },
+            "hedged_reads": self.client.hedge_budget.as_dict(),
+            "devices": {
+                device_id: {
+                    "profile_id": device.profile.profile_id,
+                    "available": self.is_available(device_id),
+                    "stale": self.is_stale(device_id),
+                    "status_age": (
+                        round(now - self._good_at[device_id], 1)
+                        if device_id in self._good_at
+                        else None
+                    ),
+                    "poll_interval": self.scheduler.state(device_id).interval,
+                    "poll_failures": self.scheduler.state(device_id).failures,
+                    "status": (
+                        dict(self.data[device_id]) if device_id in self.data else None
+                    ),
+                }
+                for device_id, device in self.devices.items()
+            },
+        }
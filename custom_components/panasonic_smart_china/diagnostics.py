@@ -0,0 +1,44 @@
+"""Diagnostics support for Panasonic Smart China."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_FAMILY_ID,
+    CONF_LOGIN_DIGEST,
+    CONF_REAL_FAMILY_ID,
+    CONF_SSID,
+    CONF_TOKEN,
+    CONF_USERNAME,
+    CONF_USR_ID,
+    DOMAIN,
+)
+
+TO_REDACT = {
+    CONF_FAMILY_ID,
+    CONF_LOGIN_DIGEST,
+    CONF_REAL_FAMILY_ID,
+    CONF_SSID,
+    CONF_TOKEN,
+    CONF_USERNAME,
+    CONF_USR_ID,
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for an account entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": async_redact_data(coordinator.diagnostics(), TO_REDACT),
+    }
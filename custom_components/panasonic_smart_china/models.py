@@ -15,6 +15,11 @@ PROTOCOL_BATHROOM_HEATER = "bathroom_heater"
 
 TOKEN_STRATEGY_DEVICE_ID_SHA512 = "device_id_sha512"
 
+# Read-modify-write reads the current status and only changes the commanded
+# fields; fixed-payload profiles build the whole command without a read.
+WRITE_STRATEGY_READ_MODIFY_WRITE = "read_modify_write"
+WRITE_STRATEGY_FIXED_PAYLOAD = "fixed_payload"
+
 
 @dataclass(frozen=True)
 class PanasonicEndpoint:
@@ -42,6 +47,7 @@ class PanasonicProfile:
     set_endpoint: PanasonicEndpoint
     model_ids: frozenset[str] = frozenset()
     token_strategy: str = TOKEN_STRATEGY_DEVICE_ID_SHA512
+    write_strategy: str = WRITE_STRATEGY_READ_MODIFY_WRITE
     temp_scale: int = 1
     default_hvac_mode: Any | None = None
     hvac_mapping: dict[Any, int] = field(default_factory=dict)
@@ -51,11 +57,27 @@ class PanasonicProfile:
     cookie_required: bool = False
     referer_template: str | None = None
     extra_control_headers: dict[str, str] = field(default_factory=dict)
+    power_key: str | None = None
+    power_off_values: frozenset[int] = frozenset()
+    activity_keys: tuple[str, ...] = ()
 
     def matches_category(self, category_id: str | None) -> bool:
         """Return whether this profile supports a Panasonic category id."""
         return bool(category_id and category_id in self.category_ids)
 
+    def is_powered_off(self, status: dict[str, Any]) -> bool:
+        """Return whether a status payload reports the device as off."""
+        if not self.power_key:
+            return False
+        try:
+            return int(status.get(self.power_key)) in self.power_off_values
+        except (TypeError, ValueError):
+            return False
+
+    def activity_signature(self, status: dict[str, Any]) -> tuple[Any, ...]:
+        """Return the status fields used to detect user-visible activity."""
+        return tuple(status.get(key) for key in self.activity_keys)
+
     def matches_device(
         self,
         category_id: str | None,
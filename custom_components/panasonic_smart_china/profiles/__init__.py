@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 
+from ..codec import ProfileCodec, compile_profile
 from ..models import PanasonicProfile
 from .bathroom_heater_0820_fv_rb20vl1 import (
     BATHROOM_HEATER_0820_FV_RB20VL1_PROFILE,
@@ -17,6 +18,12 @@ SUPPORTED_PROFILES = {
     ),
 }
 
+# Codecs are compiled once at import; entities only look them up.
+PROFILE_CODECS = {
+    key: compile_profile(profile)
+    for key, profile in SUPPORTED_PROFILES.items()
+}
+
 SUPPORTED_CONTROLLERS = {
     profile.controller_model: profile
     for profile in SUPPORTED_PROFILES.values()
@@ -45,6 +52,14 @@ def find_profile(profile_id: str | None) -> PanasonicProfile | None:
     return SUPPORTED_PROFILES.get(profile_id)
 
 
+def profile_codec(profile: PanasonicProfile) -> ProfileCodec:
+    """Return the compiled codec of a profile."""
+    codec = PROFILE_CODECS.get(profile.profile_id)
+    if codec is None or codec.profile is not profile:
+        codec = compile_profile(profile)
+    return codec
+
+
 def find_profile_for_controller(controller_model: str | None) -> PanasonicProfile | None:
     """Find a profile by controller/model key stored in config entries."""
     if not controller_model:
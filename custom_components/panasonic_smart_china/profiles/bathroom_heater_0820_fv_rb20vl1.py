@@ -8,6 +8,7 @@ from ..models import (
     ENTITY_KIND_BATHROOM_HEATER,
     PLATFORM_CLIMATE,
     PROTOCOL_BATHROOM_HEATER,
+    WRITE_STRATEGY_FIXED_PAYLOAD,
     PanasonicEndpoint,
     PanasonicProfile,
 )
@@ -41,6 +42,7 @@ BATHROOM_HEATER_0820_FV_RB20VL1_PROFILE = PanasonicProfile(
         require_results=False,
         allow_non_json_response=True,
     ),
+    write_strategy=WRITE_STRATEGY_FIXED_PAYLOAD,
     default_hvac_mode=HVACMode.FAN_ONLY,
     hvac_mapping=HVAC_MAPPING,
     cookie_required=True,
@@ -48,4 +50,7 @@ BATHROOM_HEATER_0820_FV_RB20VL1_PROFILE = PanasonicProfile(
         "https://app.psmartcloud.com/ca/cn/0820/RB20VL1/index.html"
         "?deviceId={device_id}&devType=FV-RB20VL1"
     ),
+    power_key="runningMode",
+    power_off_values=frozenset({0, 32}),
+    activity_keys=("runningMode",),
 )
@@ -97,4 +97,7 @@ DUCTED_AC_0900_PROFILE = PanasonicProfile(
         FAN_MUTE: {"windSet": 10, "muteMode": 1},
     },
     safe_status_keys=SAFE_STATUS_KEYS,
+    power_key="runStatus",
+    power_off_values=frozenset({0}),
+    activity_keys=("runStatus", "runMode"),
 )
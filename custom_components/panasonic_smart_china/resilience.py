@@ -0,0 +1,303 @@
+"""Retry, circuit breaker and rate limiting helpers for the Panasonic cloud client."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import heapq
+import itertools
+import random
+import time
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30.0
+
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 4.0
+
+# Priority lanes for outbound requests; lower values are served first.
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+PRIORITY_DISCOVERY = 2
+
+RATE_LIMIT_MAX_RATE = 10.0
+RATE_LIMIT_MIN_RATE = 1.0
+RATE_LIMIT_BURST = 10.0
+RATE_LIMIT_DECREASE_FACTOR = 0.5
+RATE_LIMIT_DECREASE_COOLDOWN = 2.0
+RATE_LIMIT_RECOVERY_STEP = 0.05
+
+LATENCY_WINDOW = 100
+LATENCY_MIN_SAMPLES = 20
+
+# Request timeouts: a multiple of the endpoint's p99 latency, clamped to the
+# configured bounds. Endpoints without enough samples, or whose last request
+# timed out, use a fallback timeout until a response is measured again.
+REQUEST_TIMEOUT_MIN = 3.0
+REQUEST_TIMEOUT_MAX = 30.0
+REQUEST_TIMEOUT_FALLBACK = 10.0
+TIMEOUT_PERCENTILE = 0.99
+TIMEOUT_LATENCY_MULTIPLIER = 3.0
+
+HEDGE_PERCENTILE = 0.95
+HEDGE_BUDGET = 5
+HEDGE_BUDGET_WINDOW = 60.0
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = RETRY_BASE_DELAY,
+    cap: float = RETRY_MAX_DELAY,
+) -> float:
+    """Return a full-jitter exponential backoff delay for a retry attempt."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one cloud endpoint.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are short-circuited. Once ``reset_timeout`` has passed a single
+    probe request is let through (half-open); its outcome closes or re-opens
+    the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CIRCUIT_CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return CIRCUIT_HALF_OPEN
+        return CIRCUIT_OPEN
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return True
+        if state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probe_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Free the half-open probe slot of a request that was abandoned."""
+        self._probe_in_flight = False
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+        }
+
+
+class AdaptiveRateLimiter:
+    """Token bucket for the Panasonic cloud host with AIMD rate adaptation.
+
+    Errors and timeouts halve the refill rate (at most once per cooldown, so
+    a burst of concurrent failures counts once); each success raises it by a
+    small step back towards the maximum. When tokens run out, waiters are
+    served by priority lane and then in arrival order.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = RATE_LIMIT_MAX_RATE,
+        min_rate: float = RATE_LIMIT_MIN_RATE,
+        burst: float = RATE_LIMIT_BURST,
+    ) -> None:
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.rate = max_rate
+        self._tokens = burst
+        self._refilled_at = time.monotonic()
+        self._decreased_at = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatch_handle: asyncio.TimerHandle | None = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled_at) * self.rate
+        )
+        self._refilled_at = now
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> None:
+        """Wait for a request token in the given priority lane."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self._schedule_dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just before the caller was cancelled: hand it back.
+                self._tokens += 1
+                self._schedule_dispatch()
+            raise
+
+    def _schedule_dispatch(self) -> None:
+        if self._dispatch_handle is not None or not self._waiters:
+            return
+        self._refill()
+        delay = 0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+        self._dispatch_handle = asyncio.get_running_loop().call_later(
+            delay, self._dispatch
+        )
+
+    def _dispatch(self) -> None:
+        self._dispatch_handle = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self._tokens -= 1
+            waiter.set_result(None)
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        self._schedule_dispatch()
+
+    def record_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + RATE_LIMIT_RECOVERY_STEP)
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        if now - self._decreased_at < RATE_LIMIT_DECREASE_COOLDOWN:
+            return
+        self._decreased_at = now
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * RATE_LIMIT_DECREASE_FACTOR)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "rate": round(self.rate, 2),
+            "tokens": round(self._tokens, 2),
+            "waiting": len(self._waiters),
+        }
+
+
+class LatencyTracker:
+    """Rolling window of response latencies for one cloud endpoint."""
+
+    def __init__(
+        self,
+        window: int = LATENCY_WINDOW,
+        min_samples: int = LATENCY_MIN_SAMPLES,
+    ) -> None:
+        self.min_samples = min_samples
+        self.timed_out = False
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+        self.timed_out = False
+
+    def record_timeout(self) -> None:
+        """Note a timed-out request.
+
+        The timeout is not a latency sample: feeding it back in would raise
+        every following timeout in steps up to the upper bound.
+        """
+        self.timed_out = True
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the interpolated latency percentile.
+
+        Returns None until enough samples exist.
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = fraction * (len(ordered) - 1)
+        lower = int(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+    def timeout(
+        self,
+        minimum: float = REQUEST_TIMEOUT_MIN,
+        maximum: float = REQUEST_TIMEOUT_MAX,
+        fallback: float = REQUEST_TIMEOUT_FALLBACK,
+    ) -> float:
+        """Return the request timeout derived from the observed latencies."""
+        p99 = None if self.timed_out else self.percentile(TIMEOUT_PERCENTILE)
+        if p99 is None:
+            return min(maximum, max(minimum, fallback))
+        return min(maximum, max(minimum, p99 * TIMEOUT_LATENCY_MULTIPLIER))
+
+    def as_dict(self) -> dict[str, object]:
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        return {
+            "samples": len(self._samples),
+            "p50": round(p50, 3) if p50 is not None else None,
+            "p95": round(p95, 3) if p95 is not None else None,
+        }
+
+
+class HedgeBudget:
+    """Allow at most ``limit`` hedged requests per ``window`` seconds.
+
+    Hedges are only worth sending for the occasional slow request; the cap
+    keeps a slow cloud from doubling the load we put on it.
+    """
+
+    def __init__(
+        self,
+        limit: int = HEDGE_BUDGET,
+        window: float = HEDGE_BUDGET_WINDOW,
+    ) -> None:
+        self.limit = limit
+        self.window = window
+        self.sent = 0
+        self._sent_at: deque[float] = deque()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        while self._sent_at and now - self._sent_at[0] >= self.window:
+            self._sent_at.popleft()
+        if len(self._sent_at) >= self.limit:
+            return False
+        self._sent_at.append(now)
+        self.sent += 1
+        return True
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "sent": self.sent,
+            "in_window": len(self._sent_at),
+        }
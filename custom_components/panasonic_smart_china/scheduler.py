@@ -0,0 +1,145 @@
+"""Adaptive per-device polling cadence for Panasonic Smart China."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+from typing import Any
+
+from .models import PanasonicProfile
+
+FAST_POLL_WINDOW = 30.0
+IDLE_AFTER_UNCHANGED_CYCLES = 8
+
+
+def poll_phase(device_id: str) -> float:
+    """Return a stable fraction in [0, 1) used to stagger a device's polls."""
+    digest = hashlib.sha1(device_id.encode()).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32
+
+
+@dataclass
+class DevicePollState:
+    """Scheduling state of a single device."""
+
+    next_poll: float = 0.0
+    interval: float = 0.0
+    fast_until: float = 0.0
+    failures: int = 0
+    unchanged_cycles: int = 0
+    signature: tuple[Any, ...] | None = None
+    phase_offset: float = 0.0
+
+
+class AdaptivePollScheduler:
+    """Decide when each device is polled next.
+
+    Devices poll at the fast interval for a short window after a command,
+    relax to the idle interval while off or unchanged for many cycles, and
+    back off exponentially (capped at the idle interval) while failing.
+    """
+
+    def __init__(
+        self,
+        fast_interval: float,
+        interval: float,
+        idle_interval: float,
+        *,
+        fast_window: float = FAST_POLL_WINDOW,
+        idle_after_cycles: int = IDLE_AFTER_UNCHANGED_CYCLES,
+    ) -> None:
+        self.fast_interval = fast_interval
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.fast_window = fast_window
+        self.idle_after_cycles = idle_after_cycles
+        self._states: dict[str, DevicePollState] = {}
+
+    def register(self, device_id: str, now: float) -> None:
+        """Track a device, staggered across the interval by its device id.
+
+        The phase is applied to the first scheduled poll; later polls are
+        relative to the previous one, so devices keep their spread.
+        """
+        phase_offset = poll_phase(device_id) * self.interval
+        self._states[device_id] = DevicePollState(
+            next_poll=now + self.interval + phase_offset,
+            interval=self.interval,
+            phase_offset=phase_offset,
+        )
+
+    def state(self, device_id: str) -> DevicePollState:
+        return self._states[device_id]
+
+    def due(self, now: float) -> list[str]:
+        """Return devices whose next poll time has passed."""
+        return [
+            device_id
+            for device_id, state in self._states.items()
+            if state.next_poll <= now
+        ]
+
+    def record_success(
+        self,
+        device_id: str,
+        profile: PanasonicProfile,
+        status: dict[str, Any],
+        now: float,
+    ) -> None:
+        state = self._states[device_id]
+        state.failures = 0
+
+        signature = profile.activity_signature(status)
+        if signature == state.signature:
+            state.unchanged_cycles += 1
+        else:
+            state.unchanged_cycles = 0
+        state.signature = signature
+
+        if now < state.fast_until:
+            interval = self.fast_interval
+        elif (
+            profile.is_powered_off(status)
+            or state.unchanged_cycles >= self.idle_after_cycles
+        ):
+            interval = self.idle_interval
+        else:
+            interval = self.interval
+        self._schedule(state, interval, now)
+
+    def record_failure(self, device_id: str, now: float) -> None:
+        state = self._states[device_id]
+        state.failures += 1
+        interval = min(
+            self.idle_interval,
+            self.interval * (2 ** (state.failures - 1)),
+        )
+        self._schedule(state, interval, now)
+
+    def boost(self, device_id: str, now: float) -> None:
+        """Poll a device quickly for a while after it was commanded."""
+        state = self._states[device_id]
+        state.fast_until = now + self.fast_window
+        state.unchanged_cycles = 0
+        state.phase_offset = 0.0
+        self._schedule(
+            state,
+            self.fast_interval,
+            now,
+            keep_earlier=True,
+        )
+
+    @staticmethod
+    def _schedule(
+        state: DevicePollState,
+        interval: float,
+        now: float,
+        *,
+        keep_earlier: bool = False,
+    ) -> None:
+        next_poll = now + interval + state.phase_offset
+        state.phase_offset = 0.0
+        if keep_earlier and state.next_poll < next_poll:
+            next_poll = state.next_poll
+        state.interval = interval
+        state.next_poll = next_poll
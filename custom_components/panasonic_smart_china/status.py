@@ -0,0 +1,124 @@
+"""Immutable device status snapshots for Panasonic Smart China."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from types import MappingProxyType
+from typing import Any
+
+from .codec import as_int
+from .models import PROTOCOL_AC_STATUS, PROTOCOL_BATHROOM_HEATER
+
+# Once an update overlay holds this many keys it is folded into a new base.
+OVERLAY_FLATTEN_SIZE = 8
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+class StatusSnapshot(Mapping[str, Any]):
+    """Read-only view of a device status payload.
+
+    Snapshots are never mutated. ``with_changes`` returns a new snapshot that
+    shares the raw payload with this one and only stores the changed fields,
+    so applying a command does not copy the whole status.
+    """
+
+    __slots__ = ("_base", "_overlay")
+
+    def __init__(
+        self,
+        base: Mapping[str, Any],
+        overlay: Mapping[str, Any] = _EMPTY,
+    ) -> None:
+        self._base = base
+        self._overlay = overlay
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> StatusSnapshot:
+        """Wrap a freshly decoded payload; the caller must not keep mutating it."""
+        return cls(MappingProxyType(payload))
+
+    def with_changes(self, changes: Mapping[str, Any]) -> StatusSnapshot:
+        """Return a snapshot with ``changes`` applied on top of this one."""
+        if not changes:
+            return self
+        overlay = {**self._overlay, **changes}
+        if len(overlay) >= OVERLAY_FLATTEN_SIZE:
+            return type(self)(MappingProxyType({**self._base, **overlay}))
+        return type(self)(self._base, MappingProxyType(overlay))
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._overlay:
+            return self._overlay[key]
+        return self._base[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._overlay or key in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._base
+        for key in self._overlay:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(
+            1 for key in self._overlay if key not in self._base
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, StatusSnapshot) and (
+            other._base is self._base and other._overlay == self._overlay
+        ):
+            return True
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            key in other and other[key] == value for key, value in self.items()
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class AcStatus(StatusSnapshot):
+    """Status of an ``ac_status`` protocol device."""
+
+    __slots__ = ()
+
+    @property
+    def run_status(self) -> int | None:
+        return as_int(self.get("runStatus"))
+
+    @property
+    def run_mode(self) -> int | None:
+        return as_int(self.get("runMode"))
+
+    @property
+    def set_temperature(self) -> int | None:
+        return as_int(self.get("setTemperature"))
+
+
+class BathroomHeaterStatus(StatusSnapshot):
+    """Status of a ``bathroom_heater`` protocol device."""
+
+    __slots__ = ()
+
+    @property
+    def running_mode(self) -> int | None:
+        return as_int(self.get("runningMode"))
+
+
+STATUS_TYPES: dict[str, type[StatusSnapshot]] = {
+    PROTOCOL_AC_STATUS: AcStatus,
+    PROTOCOL_BATHROOM_HEATER: BathroomHeaterStatus,
+}
+
+
+def status_snapshot(protocol: str, payload: dict[str, Any]) -> StatusSnapshot:
+    """Return the snapshot type of a protocol wrapping a status payload."""
+    return STATUS_TYPES.get(protocol, StatusSnapshot).from_payload(payload)